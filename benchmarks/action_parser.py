@@ -0,0 +1,93 @@
+"""Micro-benchmark: action parsing before and after the JSON-mode parser.
+
+Compares the regex extraction the conversation agent used to do with
+`action.parse_action` (incremental scanner + schema validation) on typical
+replies, and checks the cases the regex got wrong. Only needs voluptuous:
+
+    python benchmarks/action_parser.py
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import re
+import timeit
+from pathlib import Path
+
+ACTION_PY = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components" / "mistral_conversation" / "action.py"
+)
+_spec = importlib.util.spec_from_file_location("action", ACTION_PY)
+action = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(action)
+
+NUMBER = 20000
+
+# The extraction conversation.py used before JSON mode
+_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```|(\{[^`]*?\})", re.DOTALL)
+
+
+def old_parse(text: str) -> dict | None:
+    try:
+        return json.loads(text.strip())
+    except json.JSONDecodeError:
+        pass
+    for match in _JSON_RE.finditer(text):
+        candidate = match.group(1) or match.group(2)
+        if candidate:
+            try:
+                return json.loads(candidate.strip())
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+REPLIES = {
+    "json_mode": (
+        '{"action":"call_service","domain":"light","service":"turn_on",'
+        '"entity_id":"light.kitchen","service_data":{"brightness_pct":40},'
+        '"speech":"De keukenlamp staat aan op 40%.","expects_reply":false}'
+    ),
+    "fenced_nested": (
+        'Sure!\n```json\n{"action":"call_service","domain":"climate",'
+        '"service":"set_temperature","entity_id":"climate.living",'
+        '"service_data":{"temperature":21},"confirmation":"Set to 21 degrees."}\n```'
+    ),
+    "unfenced_nested": (
+        'OK: {"action":"call_service","domain":"climate","service":"set_temperature",'
+        '"entity_id":"climate.living","service_data":{"temperature":21},'
+        '"confirmation":"Done."} '
+    ),
+    "stray_brace": (
+        'Hmm :-{ fine. {"action":"call_service","domain":"light",'
+        '"service":"turn_off","entity_id":"light.hall","speech":"Off."}'
+    ),
+    "plain": "The living room is 21.5 degrees and the kitchen light is off. " * 4,
+}
+
+
+def _found(result: dict | None) -> bool:
+    return bool(result) and result.get("action") == "call_service"
+
+
+def main() -> None:
+    print(f"{'reply':16s} {'old us':>8s} {'new us':>8s}  old found  new found")
+    for name, text in REPLIES.items():
+        old = timeit.timeit(lambda: old_parse(text), number=NUMBER) / NUMBER * 1e6
+        new = timeit.timeit(lambda: action.parse_action(text), number=NUMBER) / NUMBER * 1e6
+        print(
+            f"{name:16s} {old:8.2f} {new:8.2f}  "
+            f"{_found(old_parse(text))!s:9s}  {_found(action.parse_action(text))!s}"
+        )
+
+    # The scanner also accepts the reply in arbitrary chunks (streaming)
+    parser = action.IncrementalJsonParser()
+    text = REPLIES["fenced_nested"]
+    for i in range(0, len(text), 7):
+        parser.feed(text[i : i + 7])
+    print("streamed in 7-char chunks:", _found(parser.finish()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Benchmark: two-step voice path vs. single-call voice mode.
+
+Starts a mock Mistral API on localhost and times, end to end, the requests
+a voice command needs in each mode, built with the integration's own code:
+
+* two-step: `_pcm_to_wav`, multipart upload to /audio/transcriptions as
+  stt.py sends it, then a JSON-mode chat completion with the device list
+  and the transcript, parsed with `parse_action`;
+* single-call: `audio_user_message` with `AUDIO_RESPONSE_FORMAT`, as
+  `async_prepare_audio_turn` sends it, then the `AudioReplyCache` hand-off
+  from the STT entity to the agent.
+
+The server-side processing time of each endpoint is simulated with the
+delays below, so the totals depend on them; pass delays measured against
+the real API to compare the modes for your connection. The client
+overhead column (total minus simulated server time) is the part the
+integration itself adds: encoding, request building, round trips and
+parsing. Needs the test requirements (Home Assistant, aiohttp):
+
+    python benchmarks/voice_latency.py --runs 50 --stt-delay 0.35 \\
+        --chat-delay 0.45 --audio-chat-delay 0.6
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from custom_components.mistral_conversation.action import (  # noqa: E402
+    ACTION_PROMPT,
+    AUDIO_RESPONSE_FORMAT,
+    RESPONSE_FORMAT,
+    parse_action,
+    parse_transcript,
+)
+from custom_components.mistral_conversation.audio_intent import (  # noqa: E402
+    AudioReplyCache,
+    audio_user_message,
+)
+from custom_components.mistral_conversation.backend import chat_request  # noqa: E402
+from custom_components.mistral_conversation.const import (  # noqa: E402
+    AUDIO_CHAT_MODEL,
+    DEFAULT_MODEL,
+    DEFAULT_PROMPT,
+    STT_MODEL,
+)
+from custom_components.mistral_conversation.stt import _pcm_to_wav  # noqa: E402
+
+LANGUAGE = "en"
+TRANSCRIPT = "turn on the kitchen light"
+ACTION = {
+    "action": "call_service",
+    "domain": "light",
+    "service": "turn_on",
+    "entity_id": "light.kitchen",
+    "service_data": {},
+    "speech": "The kitchen light is on.",
+    "expects_reply": False,
+}
+# The device list for ~150 exposed entities, as state_context renders it
+DEVICES = "Exposed smart home devices:\n" + "\n".join(
+    f"  light.room_{i} | Room {i} light | state: off" for i in range(150)
+)
+
+
+def _completion(content: dict) -> dict:
+    return {
+        "choices": [{"message": {"role": "assistant", "content": json.dumps(content)}}],
+        "usage": {"total_tokens": 0},
+    }
+
+
+def _mock_app(args: argparse.Namespace) -> web.Application:
+    async def transcriptions(request: web.Request) -> web.Response:
+        form = await request.post()
+        assert form["model"] == STT_MODEL
+        await asyncio.sleep(args.stt_delay)
+        return web.json_response({"text": TRANSCRIPT})
+
+    async def chat(request: web.Request) -> web.Response:
+        payload = await request.json()
+        if payload["model"] == AUDIO_CHAT_MODEL:
+            assert payload["response_format"] == AUDIO_RESPONSE_FORMAT
+            await asyncio.sleep(args.audio_chat_delay)
+            return web.json_response(_completion({"transcript": TRANSCRIPT, **ACTION}))
+        assert payload["response_format"] == RESPONSE_FORMAT
+        await asyncio.sleep(args.chat_delay)
+        return web.json_response(_completion(ACTION))
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post("/v1/audio/transcriptions", transcriptions)
+    app.router.add_post("/v1/chat/completions", chat)
+    return app
+
+
+async def _two_step(session: aiohttp.ClientSession, base: str, pcm: bytes) -> None:
+    wav = _pcm_to_wav(pcm, sample_rate=16000, channels=1, sample_width=2)
+    form = aiohttp.FormData()
+    form.add_field("file", wav, filename="audio.wav", content_type="application/octet-stream")
+    form.add_field("model", STT_MODEL)
+    form.add_field("language", LANGUAGE)
+    async with session.post(
+        f"{base}/audio/transcriptions",
+        headers={"Authorization": "Bearer test"},
+        data=form,
+    ) as resp:
+        text = (await resp.json())["text"].strip()
+    payload = {
+        "model": DEFAULT_MODEL,
+        "messages": [
+            {"role": "system", "content": DEFAULT_PROMPT + ACTION_PROMPT},
+            {"role": "user", "content": f"{DEVICES}\n\n{text}"},
+        ],
+        "response_format": RESPONSE_FORMAT,
+    }
+    async with session.post(**chat_request(base, "test", payload, timeout=30)) as resp:
+        raw_reply = (await resp.json())["choices"][0]["message"]["content"]
+    assert parse_action(raw_reply) is not None
+
+
+async def _single_call(
+    session: aiohttp.ClientSession, base: str, pcm: bytes, cache: AudioReplyCache
+) -> None:
+    wav = _pcm_to_wav(pcm, sample_rate=16000, channels=1, sample_width=2)
+    payload = {
+        "model": AUDIO_CHAT_MODEL,
+        "messages": [
+            {"role": "system", "content": f"{DEFAULT_PROMPT}\n\n{DEVICES}{ACTION_PROMPT}"},
+            audio_user_message(wav, LANGUAGE),
+        ],
+        "response_format": AUDIO_RESPONSE_FORMAT,
+    }
+    async with session.post(**chat_request(base, "test", payload, timeout=30)) as resp:
+        raw_reply = (await resp.json())["choices"][0]["message"]["content"]
+    transcript = parse_transcript(raw_reply)
+    assert transcript and parse_action(raw_reply) is not None
+    cache.put(transcript, raw_reply)
+    # The pipeline hands the transcript to the agent, which takes the reply
+    assert parse_action(cache.pop(transcript)) is not None
+
+
+async def main(args: argparse.Namespace) -> None:
+    runner = web.AppRunner(_mock_app(args))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    base = f"http://{host}:{port}/v1"
+    # Silence of the recorded length, as 16 kHz mono 16-bit PCM frames
+    pcm = b"\0\0" * int(args.audio_seconds * 16000)
+    cache = AudioReplyCache()
+
+    async with aiohttp.ClientSession() as session:
+        modes = (
+            ("two-step", lambda: _two_step(session, base, pcm), args.stt_delay + args.chat_delay),
+            ("single-call", lambda: _single_call(session, base, pcm, cache), args.audio_chat_delay),
+        )
+        for name, run, server_time in modes:
+            await run()  # warm up the connection
+            samples = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                await run()
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            median = statistics.median(samples)
+            print(
+                f"{name:12s} median {median:7.1f} ms  "
+                f"p95 {samples[int(len(samples) * 0.95) - 1]:7.1f} ms  "
+                f"min {samples[0]:7.1f} ms  "
+                f"client overhead {median - server_time * 1000:6.1f} ms"
+            )
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--audio-seconds", type=float, default=2.0)
+    parser.add_argument("--stt-delay", type=float, default=0.35)
+    parser.add_argument("--chat-delay", type=float, default=0.45)
+    parser.add_argument("--audio-chat-delay", type=float, default=0.6)
+    asyncio.run(main(parser.parse_args()))
@@ -2,51 +2,186 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN, MISTRAL_API_BASE
+from .backend import LocalBackend
+from .catalog import InvalidApiKey, ModelCatalog, async_get_catalog
+from .continuation import ContinuationStats
+from .const import (
+    CATALOG_CHECK_INTERVAL,
+    DOMAIN,
+    LOCAL_HEALTH_INTERVAL,
+    SIGNAL_OPTIONS_UPDATED,
+    SUBENTRY_AGENT,
+)
+from .entity_index import ExposedEntityIndex
+from .key_pool import ApiKeyPool, entry_api_keys, key_fingerprint
+from .prompt import PromptTemplateCache
+from .service_executor import ServiceExecutor
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-PLATFORMS = ["conversation", "stt"]
+PLATFORMS = ["conversation", "sensor", "stt"]
+
+
+@dataclass
+class MistralData:
+    """Runtime state of a config entry, kept in hass.data[DOMAIN].
+
+    Shared by the default agent, every agent profile and the STT entity,
+    so adding an agent does not add another index, executor or cache.
+    """
+
+    pool: ApiKeyPool
+    index: ExposedEntityIndex
+    executor: ServiceExecutor
+    templates: PromptTemplateCache
+    local: LocalBackend
+    agent_ids: frozenset[str]
+    continuation: ContinuationStats
+    # Set by the default agent: (wav_bytes, language) -> transcript or None
+    prepare_audio: Callable[[bytes, str], Awaitable[str | None]] | None = None
+
+
+def _agent_ids(entry: ConfigEntry) -> frozenset[str]:
+    """Return the subentry IDs of the agent profiles of an entry."""
+    return frozenset(
+        subentry_id
+        for subentry_id, subentry in entry.subentries.items()
+        if subentry.subentry_type == SUBENTRY_AGENT
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Mistral AI Conversation from a config entry."""
-    api_key = entry.data[CONF_API_KEY]
-    session = async_get_clientsession(hass)
-    try:
-        async with session.get(
-            f"{MISTRAL_API_BASE}/models",
-            headers={"Authorization": f"Bearer {api_key}"},
-            timeout=aiohttp.ClientTimeout(total=10),
-        ) as resp:
-            if resp.status == 401:
-                _LOGGER.error("Invalid Mistral AI API key")
-                return False
-            resp.raise_for_status()
-    except aiohttp.ClientError as err:
-        raise ConfigEntryNotReady(f"Cannot connect to Mistral AI: {err}") from err
+    # Only reads the on-disk cache; the API key is validated in the background
+    # so a slow or offline link does not hold up Home Assistant startup.
+    catalog = await async_get_catalog(hass)
+    data = hass.data.setdefault(DOMAIN, {})[entry.entry_id] = MistralData(
+        pool=ApiKeyPool(hass, entry.entry_id, entry_api_keys(entry)),
+        index=ExposedEntityIndex(hass),
+        executor=ServiceExecutor(hass),
+        templates=PromptTemplateCache(hass),
+        local=LocalBackend(hass, entry),
+        agent_ids=_agent_ids(entry),
+        continuation=ContinuationStats(hass, entry.entry_id),
+    )
+    entry.async_on_unload(data.index.async_listen())
+    entry.async_on_unload(data.executor.async_cancel_all)
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            data.local.async_health_check,
+            timedelta(seconds=LOCAL_HEALTH_INTERVAL),
+        )
+    )
+
+    async def _async_refresh_catalog(_now: datetime) -> None:
+        await _async_validate(hass, entry, catalog, force=False)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            _async_refresh_catalog,
+            timedelta(seconds=CATALOG_CHECK_INTERVAL),
+        )
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    entry.async_create_background_task(
+        hass,
+        _async_validate(hass, entry, catalog),
+        f"{DOMAIN} validate {entry.entry_id}",
+    )
+    return True
+
+
+async def _async_validate(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    catalog: ModelCatalog,
+    force: bool = True,
+) -> None:
+    """Check the API key and raise a repair issue if it is rejected.
+
+    At setup the request is always made, even when the cached catalog is
+    fresh, since the catalog is shared by all entries and its TTL says
+    nothing about this entry's key. With the ETag this is usually a
+    bodyless 304. The hourly check (`force=False`) only fetches once the
+    TTL has passed, so the catalog is refreshed once a day while Home
+    Assistant runs, whichever entry gets to it first.
+    """
+    issue_id = f"invalid_api_key_{entry.entry_id}"
+    try:
+        if not await catalog.async_refresh(entry.data[CONF_API_KEY], force=force):
+            return
+    except InvalidApiKey:
+        _LOGGER.error("Invalid Mistral AI API key")
+        ir.async_create_issue(
+            hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.ERROR,
+            translation_key="invalid_api_key",
+            translation_placeholders={"title": entry.title},
+        )
+        return
+    except (aiohttp.ClientError, TimeoutError) as err:
+        _LOGGER.warning("Cannot refresh Mistral AI model list: %s", err)
+        return
+    ir.async_delete_issue(hass, DOMAIN, issue_id)
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate a config entry to the current version."""
+    if entry.version > 1:
+        return False
+    if entry.minor_version < 2:
+        # Entries used to be unique per integration, now per API key
+        unique_id = entry.unique_id
+        if unique_id == DOMAIN:
+            unique_id = key_fingerprint(entry.data[CONF_API_KEY])
+        hass.config_entries.async_update_entry(
+            entry, unique_id=unique_id, minor_version=2
+        )
+        _LOGGER.debug("Migrated entry %s to version 1.2", entry.entry_id)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        hass.data[DOMAIN].pop(entry.entry_id)
+    return unload_ok
+
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Hot-apply changed options; reload only when keys or agents changed.
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload entry when options change."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    A reload would tear down all platforms and drop every conversation
+    history, so the running entities are told to pick up the new options.
+    Editing an existing agent profile is applied in place as well.
+    """
+    data: MistralData = hass.data[DOMAIN][entry.entry_id]
+    if (
+        entry_api_keys(entry) != data.pool.api_keys
+        or _agent_ids(entry) != data.agent_ids
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    async_dispatcher_send(hass, f"{SIGNAL_OPTIONS_UPDATED}_{entry.entry_id}")
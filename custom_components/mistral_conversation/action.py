@@ -0,0 +1,330 @@
+"""Structured action payloads returned by the model in JSON mode."""
+from __future__ import annotations
+
+import bisect
+import copy
+import json
+import re
+from typing import Any
+
+import voluptuous as vol
+
+ACTION_CALL_SERVICE = "call_service"
+ACTION_REPLY = "reply"
+
+# ---------------------------------------------------------------------------
+# Allowed HA service calls (safety allow-list)
+# ---------------------------------------------------------------------------
+ALLOWED_SERVICES: dict[str, list[str]] = {
+    "homeassistant": ["turn_on", "turn_off", "toggle"],
+    "light":         ["turn_on", "turn_off", "toggle"],
+    "switch":        ["turn_on", "turn_off", "toggle"],
+    "cover":         ["open_cover", "close_cover", "stop_cover", "set_cover_position"],
+    "media_player":  [
+        "turn_on", "turn_off", "toggle",
+        "media_play", "media_pause", "media_stop",
+        "volume_up", "volume_down", "volume_set", "volume_mute",
+        "select_source", "select_sound_mode",
+        "media_next_track", "media_previous_track",
+    ],
+    "fan":           ["turn_on", "turn_off", "toggle", "set_percentage", "set_preset_mode"],
+    "climate":       ["turn_on", "turn_off", "set_temperature", "set_hvac_mode"],
+    "lock":          ["lock", "unlock"],
+    "alarm_control_panel": ["alarm_arm_away", "alarm_arm_home", "alarm_disarm"],
+    "scene":         ["turn_on"],
+    "script":        ["turn_on"],
+    "automation":    ["turn_on", "turn_off", "trigger"],
+    "input_boolean": ["turn_on", "turn_off", "toggle"],
+    "input_number":  ["set_value"],
+    "number":        ["set_value"],
+}
+
+# (domain, service) pairs for O(1) membership checks
+ALLOWED_SERVICE_INDEX: frozenset[tuple[str, str]] = frozenset(
+    (domain, service)
+    for domain, services in ALLOWED_SERVICES.items()
+    for service in services
+)
+
+
+# ---------------------------------------------------------------------------
+# JSON mode
+# ---------------------------------------------------------------------------
+
+def _build_response_format() -> dict[str, Any]:
+    """Build the Mistral `response_format` payload from the allow-list."""
+    services = sorted({svc for svcs in ALLOWED_SERVICES.values() for svc in svcs})
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "home_assistant_action",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": [ACTION_REPLY, ACTION_CALL_SERVICE],
+                    },
+                    "speech": {"type": "string"},
+                    "expects_reply": {"type": "boolean"},
+                    "domain": {"type": "string", "enum": sorted(ALLOWED_SERVICES)},
+                    "service": {"type": "string", "enum": services},
+                    "entity_id": {"type": "string"},
+                    "service_data": {"type": "object"},
+                },
+                "required": ["action", "speech", "expects_reply"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _with_transcript(response_format: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of response_format that also asks for a transcript.
+
+    The transcript comes first so the model writes it before the action.
+    """
+    response_format = copy.deepcopy(response_format)
+    json_schema = response_format["json_schema"]
+    json_schema["name"] = "home_assistant_audio_action"
+    schema = json_schema["schema"]
+    schema["properties"] = {"transcript": {"type": "string"}, **schema["properties"]}
+    schema["required"] = ["transcript", *schema["required"]]
+    return response_format
+
+
+# Sent with every chat request when HA control is enabled
+RESPONSE_FORMAT = _build_response_format()
+# Sent with audio requests in single-call voice mode
+AUDIO_RESPONSE_FORMAT = _with_transcript(RESPONSE_FORMAT)
+
+ACTION_PROMPT = (
+    "\n\nAlways respond with ONLY a raw JSON object — no extra text, no markdown fences.\n"
+    "For information requests or general conversation:\n"
+    '{"action":"reply","speech":"Your answer in the user\'s language","expects_reply":false}\n'
+    "When the user wants to control a device:\n"
+    '{"action":"call_service","domain":"DOMAIN","service":"SERVICE","entity_id":"ENTITY_ID",'
+    '"service_data":{},"speech":"A short friendly confirmation in the user\'s language",'
+    '"expects_reply":false}\n'
+    "Fill 'service_data' with any extra parameters needed (e.g. volume_level, temperature). "
+    "Leave it as {} if no extra parameters are needed. "
+    "Always write 'speech' in the same language the user is speaking. "
+    "Set 'expects_reply' to true only if 'speech' asks the user something "
+    "and you are waiting for their answer."
+)
+
+# Text part of the user message that carries the audio in single-call mode
+AUDIO_PROMPT = (
+    "The user's request is the attached audio. Put a verbatim transcript of it "
+    "in 'transcript', in the language that is spoken, and respond to it as "
+    "instructed above."
+)
+
+
+def _normalise(action: dict[str, Any]) -> dict[str, Any]:
+    """Fold the legacy `confirmation` field into `speech`."""
+    confirmation = action.pop("confirmation", "")
+    action["speech"] = (action["speech"] or confirmation).strip()
+    if action["service_data"] is None:
+        action["service_data"] = {}
+    return action
+
+
+# Compiled once at import; validates shape only — the allow-list is enforced
+# by the caller so blocked calls can be logged and answered.
+_ACTION_VALIDATOR = vol.All(
+    vol.Schema(
+        {
+            vol.Required("action"): vol.In((ACTION_REPLY, ACTION_CALL_SERVICE)),
+            vol.Optional("speech", default=""): str,
+            vol.Optional("expects_reply", default=None): vol.Any(bool, None),
+            vol.Optional("confirmation", default=""): str,
+            vol.Optional("domain", default=""): str,
+            vol.Optional("service", default=""): str,
+            vol.Optional("entity_id", default=""): vol.Any(str, [str]),
+            vol.Optional("service_data", default=dict): vol.Any(dict, None),
+        },
+        extra=vol.REMOVE_EXTRA,
+    ),
+    _normalise,
+)
+
+
+def action_entity_ids(action: dict[str, Any]) -> list[str]:
+    """Return the target entity IDs of an action as a list."""
+    entity_id = action["entity_id"]
+    if isinstance(entity_id, str):
+        entity_id = entity_id.split(",")
+    return [eid.strip() for eid in entity_id if eid.strip()]
+
+
+def action_problem(
+    action: dict[str, Any], exposed: dict[str, frozenset[str]]
+) -> str | None:
+    """Return why a call_service action may not run, or None if it is valid.
+
+    `exposed` maps each domain to its exposed entity IDs. The generic
+    `homeassistant` services may only target allow-listed domains.
+    """
+    domain = action["domain"]
+    service = action["service"]
+    if (domain, service) not in ALLOWED_SERVICE_INDEX:
+        return f"{domain}.{service} is not permitted"
+    entity_ids = action_entity_ids(action)
+    if not entity_ids:
+        return f"{domain}.{service} needs an entity_id"
+    for entity_id in entity_ids:
+        target = entity_id.partition(".")[0]
+        if domain == "homeassistant":
+            if target == "homeassistant" or target not in ALLOWED_SERVICES:
+                return f"{entity_id} cannot be controlled"
+        elif target != domain:
+            return f"{entity_id} is not a {domain} entity"
+        if entity_id not in exposed.get(target, ()):
+            return f"{entity_id} is not an exposed entity"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+# Only these characters change the scanner state; everything else is skipped in C
+_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+# Objects tried inside one invalid candidate before it is given up on
+_MAX_NESTED_CANDIDATES = 64
+
+
+class IncrementalJsonParser:
+    """Single-pass scanner for the first JSON object in a (streamed) text.
+
+    Feed chunks as they arrive; brace nesting and string/escape state are
+    carried across chunk boundaries, so each structural character is
+    scanned once and `json.loads` only runs on balanced candidates. Handles
+    nested objects and objects wrapped in prose or markdown fences. If a
+    candidate is not valid JSON, the objects nested in it are tried in
+    order; a stray `{` that is never closed is skipped by `finish`.
+    """
+
+    def __init__(self) -> None:
+        self.result: Any | None = None
+        # Text since the oldest unclosed brace, and the offsets of those braces
+        self._buf = ""
+        self._open: list[int] = []
+        # Closed brace groups by nesting depth, as sorted (starts, ends)
+        self._groups: dict[int, tuple[list[int], list[int]]] = {}
+        self._in_string = False
+        self._skip = 0
+
+    def feed(self, chunk: str) -> Any | None:
+        """Consume a chunk; return the parsed object once it is complete."""
+        if self.result is not None:
+            return self.result
+        offset = len(self._buf)
+        self._buf += chunk
+        for match in _STRUCTURAL_RE.finditer(chunk):
+            pos = offset + match.start()
+            if pos < self._skip:
+                continue
+            char = match.group()
+            if self._in_string:
+                if char == "\\":
+                    self._skip = pos + 2
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = bool(self._open)
+            elif char == "{":
+                self._open.append(pos)
+            elif char == "}" and self._open:
+                start = self._open.pop()
+                depth = len(self._open)
+                starts, ends = self._groups.setdefault(depth, ([], []))
+                starts.append(start)
+                ends.append(pos + 1)
+                if depth:
+                    continue
+                if self._search(0, start, pos + 1):
+                    return self.result
+                self._groups.clear()
+        if not self._open:
+            self._buf = ""
+            self._skip = 0
+        return None
+
+    def finish(self) -> Any | None:
+        """Signal the end of the text; return the parsed object, if any.
+
+        An unclosed `{` before the object (e.g. the emoticon in ":-{ ...")
+        keeps it from ever closing at the top level. Such braces are taken
+        as text: every group that is only nested in them is tried in order.
+        """
+        if self.result is not None or not self._open:
+            return self.result
+        candidates = []
+        bounds = [*self._open, len(self._buf)]
+        for depth in range(1, len(self._open) + 1):
+            starts, ends = self._groups.get(depth, ([], []))
+            lo = bisect.bisect_right(starts, bounds[depth - 1])
+            hi = bisect.bisect_left(starts, bounds[depth])
+            candidates.extend(
+                (start, depth, end) for start, end in zip(starts[lo:hi], ends[lo:hi])
+            )
+        for start, depth, end in sorted(candidates):
+            if self._search(depth, start, end):
+                break
+        return self.result
+
+    def _search(self, depth: int, start: int, end: int) -> bool:
+        """Parse the group at start:end, else the groups nested in it."""
+        pending = [(depth, start, end)]
+        budget = _MAX_NESTED_CANDIDATES
+        while pending and budget:
+            budget -= 1
+            depth, start, end = pending.pop()
+            try:
+                self.result = json.loads(self._buf[start:end])
+                return True
+            except (ValueError, RecursionError):
+                # e.g. "{not json {"action": ...}}": look inside it
+                pass
+            starts, ends = self._groups.get(depth + 1, ([], []))
+            lo = bisect.bisect_right(starts, start)
+            hi = bisect.bisect_left(starts, end)
+            pending.extend(
+                (depth + 1, starts[i], ends[i]) for i in range(hi - 1, lo - 1, -1)
+            )
+        return False
+
+
+def _parse_object(text: str) -> Any | None:
+    """Return the first JSON object in text, trying a plain parse first."""
+    stripped = text.strip()
+    if stripped.startswith("{"):
+        try:
+            return json.loads(stripped)
+        except (ValueError, RecursionError):
+            pass
+    parser = IncrementalJsonParser()
+    parser.feed(text)
+    return parser.finish()
+
+
+def parse_action(text: str) -> dict[str, Any] | None:
+    """Parse and validate a model reply; return None if it is not an action."""
+    obj = _parse_object(text)
+    if not isinstance(obj, dict):
+        return None
+    try:
+        return _ACTION_VALIDATOR(obj)
+    except vol.Invalid:
+        return None
+
+
+def parse_transcript(text: str) -> str:
+    """Return the transcript of a single-call audio reply, or an empty string."""
+    obj = _parse_object(text)
+    if not isinstance(obj, dict) or not isinstance(obj.get("transcript"), str):
+        return ""
+    return obj["transcript"].strip()
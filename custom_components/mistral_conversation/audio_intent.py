@@ -0,0 +1,56 @@
+"""Single-call voice mode: transcript and reply from one Voxtral chat request."""
+from __future__ import annotations
+
+import base64
+import time
+from typing import Any
+
+from .action import AUDIO_PROMPT
+from .const import AUDIO_REPLY_TTL
+
+
+def audio_user_message(wav_bytes: bytes, language: str) -> dict[str, Any]:
+    """Return a user message carrying WAV audio for Voxtral chat."""
+    prompt = AUDIO_PROMPT
+    if language:
+        prompt += f" The user is expected to speak language code '{language}'."
+    return {
+        "role": "user",
+        "content": [
+            {
+                "type": "input_audio",
+                "input_audio": base64.b64encode(wav_bytes).decode(),
+            },
+            {"type": "text", "text": prompt},
+        ],
+    }
+
+
+class AudioReplyCache:
+    """Replies produced together with a transcript, keyed by that transcript.
+
+    The STT entity returns the transcript to the pipeline, which hands it to
+    the conversation agent a moment later; the agent then uses the stored
+    reply instead of calling the chat API. Replies the pipeline never asks
+    for (e.g. another agent is selected) expire.
+    """
+
+    def __init__(self) -> None:
+        self._replies: dict[str, tuple[float, str]] = {}
+
+    def put(self, transcript: str, reply: str) -> None:
+        """Store the reply for a transcript."""
+        self._prune()
+        self._replies[transcript.strip()] = (time.monotonic() + AUDIO_REPLY_TTL, reply)
+
+    def pop(self, text: str) -> str | None:
+        """Return and forget the reply for text, if it has not expired."""
+        self._prune()
+        if (item := self._replies.pop(text.strip(), None)) is None:
+            return None
+        return item[1]
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for transcript in [t for t, (expires, _) in self._replies.items() if expires < now]:
+            del self._replies[transcript]
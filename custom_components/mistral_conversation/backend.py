@@ -0,0 +1,149 @@
+"""Chat completion backends: Mistral cloud and a local OpenAI-compatible server."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    CONF_LOCAL_API_KEY,
+    CONF_LOCAL_BASE_URL,
+    LOCAL_HEALTH_TIMEOUT,
+    LOCAL_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Client errors that still say something about the server rather than the request
+_OVERLOADED_STATUSES = (408, 429)
+
+
+class LocalRequestRejected(HomeAssistantError):
+    """The local server is up but refused this request (4xx)."""
+
+
+def chat_request(
+    base_url: str, api_key: str | None, payload: dict[str, Any], timeout: float
+) -> dict[str, Any]:
+    """Return `session.post` arguments for a chat completion request.
+
+    Mistral's API and OpenAI-compatible servers (vLLM, llama.cpp,
+    Ollama, LM Studio) accept the same request, so both backends use this.
+    """
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return {
+        "url": f"{base_url.rstrip('/')}/chat/completions",
+        "headers": headers,
+        "json": payload,
+        "timeout": aiohttp.ClientTimeout(total=timeout),
+    }
+
+
+def chat_content(data: Any) -> str:
+    """Return the reply text of a chat completion response.
+
+    Raises HomeAssistantError if the body is not a completion, e.g. a 200
+    with an error object or a `null` content.
+    """
+    try:
+        content = data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as err:
+        raise HomeAssistantError(f"Unexpected chat completion response: {data}") from err
+    if not isinstance(content, str):
+        raise HomeAssistantError(f"Chat completion without text content: {data}")
+    return content.strip()
+
+
+class LocalBackend:
+    """A locally hosted, OpenAI-compatible chat server.
+
+    A failed request marks the server unhealthy so later requests go
+    straight to the cloud. A periodic `/models` probe marks it healthy again.
+    A request the server rejects, e.g. a 404 for a model it does not have,
+    only fails over that request.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self._hass = hass
+        self._entry = entry
+        self.healthy = True
+
+    @property
+    def base_url(self) -> str:
+        """Return the configured server URL, or an empty string."""
+        return (self._entry.options.get(CONF_LOCAL_BASE_URL) or "").strip()
+
+    @property
+    def available(self) -> bool:
+        """Return True if the server is configured and passed its last check."""
+        return bool(self.base_url) and self.healthy
+
+    async def async_chat(self, payload: dict[str, Any]) -> str:
+        """Send a chat completion and return the reply text.
+
+        Connection errors, timeouts, 5xx and malformed response bodies mark
+        the server unhealthy and are raised as aiohttp.ClientError,
+        TimeoutError or HomeAssistantError. Other 4xx responses raise
+        LocalRequestRejected and leave the health state alone.
+        """
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.post(
+                **chat_request(
+                    self.base_url,
+                    self._entry.options.get(CONF_LOCAL_API_KEY),
+                    payload,
+                    LOCAL_TIMEOUT,
+                )
+            ) as resp:
+                if resp.status >= 400:
+                    body = await resp.text()
+                    if resp.status < 500 and resp.status not in _OVERLOADED_STATUSES:
+                        raise LocalRequestRejected(
+                            f"Local model rejected the request {resp.status}: {body}"
+                        )
+                    raise HomeAssistantError(f"Local model error {resp.status}: {body}")
+                try:
+                    data = await resp.json()
+                except ValueError as err:
+                    raise HomeAssistantError(f"Local model returned invalid JSON: {err}") from err
+                return chat_content(data)
+        except LocalRequestRejected:
+            raise
+        except (aiohttp.ClientError, TimeoutError, HomeAssistantError):
+            self._set_healthy(False)
+            raise
+
+    async def async_health_check(self, _now: datetime | None = None) -> None:
+        """Probe the server's `/models` endpoint."""
+        if not self.base_url:
+            return
+        session = async_get_clientsession(self._hass)
+        api_key = self._entry.options.get(CONF_LOCAL_API_KEY)
+        try:
+            async with session.get(
+                f"{self.base_url.rstrip('/')}/models",
+                headers={"Authorization": f"Bearer {api_key}"} if api_key else {},
+                timeout=aiohttp.ClientTimeout(total=LOCAL_HEALTH_TIMEOUT),
+            ) as resp:
+                self._set_healthy(resp.status < 400)
+        except (aiohttp.ClientError, TimeoutError):
+            self._set_healthy(False)
+
+    def _set_healthy(self, healthy: bool) -> None:
+        if healthy and not self.healthy:
+            _LOGGER.info("Local model server %s is back online", self.base_url)
+        elif not healthy and self.healthy:
+            _LOGGER.warning(
+                "Local model server %s is unavailable, using Mistral cloud",
+                self.base_url,
+            )
+        self.healthy = healthy
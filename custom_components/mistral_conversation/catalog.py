@@ -0,0 +1,108 @@
+"""Cached Mistral model catalog."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import CATALOG_TTL, CHAT_MODELS, DOMAIN, MISTRAL_API_BASE
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CATALOG = f"{DOMAIN}_catalog"
+
+STORAGE_KEY = f"{DOMAIN}.models"
+STORAGE_VERSION = 1
+
+
+class InvalidApiKey(Exception):
+    """Mistral rejected the API key."""
+
+
+async def async_get_catalog(hass: HomeAssistant) -> ModelCatalog:
+    """Return the shared catalog, loading it from disk on first use."""
+    if (catalog := hass.data.get(DATA_CATALOG)) is None:
+        catalog = hass.data[DATA_CATALOG] = ModelCatalog(hass)
+        await catalog.async_load()
+    return catalog
+
+
+class ModelCatalog:
+    """The `/models` response, persisted with its ETag and fetch time.
+
+    Readers only ever touch the in-memory copy; the network is used by
+    `async_refresh`, which honours the TTL and sends `If-None-Match`.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._etag: str | None = None
+        self._fetched = 0.0
+        # model id -> max context length in tokens (None if unknown)
+        self._models: dict[str, int | None] = {}
+
+    async def async_load(self) -> None:
+        """Load the cached catalog from disk."""
+        if not (data := await self._store.async_load()):
+            return
+        self._etag = data.get("etag")
+        self._fetched = data.get("fetched", 0.0)
+        self._models = data.get("models", {})
+
+    def chat_models(self) -> list[str]:
+        """Return chat model IDs, recommended models first."""
+        if not self._models:
+            return list(CHAT_MODELS)
+        preferred = [m for m in CHAT_MODELS if m in self._models]
+        return preferred + sorted(set(self._models) - set(preferred))
+
+    def context_length(self, model: str) -> int | None:
+        """Return the context window of a model in tokens, if known."""
+        return self._models.get(model)
+
+    async def async_refresh(self, api_key: str, force: bool = False) -> bool:
+        """Fetch `/models` if the cache is stale; return True if it was requested.
+
+        Raises InvalidApiKey on 401 and aiohttp.ClientError on other failures.
+        """
+        if not force and self._models and time.time() - self._fetched < CATALOG_TTL:
+            return False
+        headers = {"Authorization": f"Bearer {api_key}"}
+        if self._etag and self._models:
+            headers["If-None-Match"] = self._etag
+        session = async_get_clientsession(self._hass)
+        async with session.get(
+            f"{MISTRAL_API_BASE}/models",
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as resp:
+            if resp.status == 401:
+                raise InvalidApiKey
+            if resp.status != 304:
+                resp.raise_for_status()
+                self._models = _parse_models(await resp.json())
+                self._etag = resp.headers.get("ETag")
+        self._fetched = time.time()
+        await self._store.async_save(
+            {"etag": self._etag, "fetched": self._fetched, "models": self._models}
+        )
+        _LOGGER.debug("Model catalog refreshed: %d chat models", len(self._models))
+        return True
+
+
+def _parse_models(data: dict[str, Any]) -> dict[str, int | None]:
+    """Keep chat-capable models and their context window."""
+    models: dict[str, int | None] = {}
+    for card in data.get("data", []):
+        if not card.get("capabilities", {}).get("completion_chat", True):
+            continue
+        if card.get("deprecation"):
+            continue
+        models[card["id"]] = card.get("max_context_length")
+    return models
@@ -7,39 +7,104 @@ from typing import Any
 import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.const import CONF_API_KEY
+from homeassistant.const import CONF_API_KEY, CONF_NAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .action import ALLOWED_SERVICES
+from .catalog import InvalidApiKey, async_get_catalog
 from .const import (
-    CHAT_MODELS,
+    BACKEND_CLOUD,
+    BACKEND_LOCAL,
+    CONF_AUDIO_INTENT,
+    CONF_AUTO_BACKGROUND,
+    CONF_BACKEND,
+    CONF_BACKGROUND_DOMAINS,
+    CONF_CONTEXT_RESYNC_INTERVAL,
     CONF_CONTINUE_CONVERSATION,
     CONF_CONTROL_HA,
+    CONF_EXPOSED_ENTITIES,
+    CONF_EXTRA_API_KEYS,
+    CONF_LOCAL_API_KEY,
+    CONF_LOCAL_BASE_URL,
+    CONF_LOCAL_MODEL,
     CONF_MAX_TOKENS,
     CONF_MODEL,
     CONF_PROMPT,
+    CONF_REPROMPT_INVALID_ACTION,
     CONF_STT_LANGUAGE,
     CONF_TEMPERATURE,
+    DEFAULT_AUDIO_INTENT,
+    DEFAULT_AUTO_BACKGROUND,
+    DEFAULT_BACKEND,
+    DEFAULT_BACKGROUND_DOMAINS,
+    DEFAULT_CONTEXT_RESYNC_INTERVAL,
     DEFAULT_CONTINUE_CONVERSATION,
     DEFAULT_CONTROL_HA,
     DEFAULT_MAX_TOKENS,
     DEFAULT_MODEL,
     DEFAULT_PROMPT,
+    DEFAULT_REPROMPT_INVALID_ACTION,
     DEFAULT_STT_LANGUAGE,
     DEFAULT_TEMPERATURE,
     DOMAIN,
-    MISTRAL_API_BASE,
+    SUBENTRY_AGENT,
 )
+from .key_pool import entry_api_keys, key_fingerprint
 from .stt import LANGUAGE_OPTIONS
 
 _LOGGER = logging.getLogger(__name__)
 
+BACKEND_OPTIONS = [
+    selector.SelectOptionDict(value=BACKEND_CLOUD, label="Mistral AI (cloud)"),
+    selector.SelectOptionDict(
+        value=BACKEND_LOCAL, label="Local server, Mistral AI as fallback"
+    ),
+]
+
+
+def _backend_fields(defaults: dict[str, Any]) -> dict:
+    """Schema fields that pick the chat backend and local model."""
+    return {
+        vol.Optional(
+            CONF_BACKEND,
+            default=defaults.get(CONF_BACKEND, DEFAULT_BACKEND),
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=BACKEND_OPTIONS,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        ),
+        vol.Optional(
+            CONF_LOCAL_MODEL,
+            description={"suggested_value": defaults.get(CONF_LOCAL_MODEL)},
+        ): selector.TextSelector(),
+    }
+
+
+async def _async_test_api_key(hass: HomeAssistant, api_key: str) -> str | None:
+    """Return an error key if api_key cannot be used, else None."""
+    # Doubles as the first catalog fetch, so setup can start from the cache
+    catalog = await async_get_catalog(hass)
+    try:
+        await catalog.async_refresh(api_key, force=True)
+    except InvalidApiKey:
+        return "invalid_auth"
+    except (aiohttp.ClientError, TimeoutError):
+        return "cannot_connect"
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.exception("Unexpected error testing API key")
+        return "unknown"
+    return None
+
 
 class MistralConversationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle the initial setup config flow."""
 
     VERSION = 1
+    # 2: unique ID is the API key fingerprint instead of DOMAIN
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -47,11 +112,12 @@ class MistralConversationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            error = await self._test_api_key(user_input[CONF_API_KEY])
+            error = await _async_test_api_key(self.hass, user_input[CONF_API_KEY])
             if error:
                 errors["base"] = error
             else:
-                await self.async_set_unique_id(DOMAIN)
+                # One entry per key; more keys can be pooled from the options
+                await self.async_set_unique_id(key_fingerprint(user_input[CONF_API_KEY]))
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
                     title="Mistral AI Conversation",
@@ -75,31 +141,19 @@ class MistralConversationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
-    async def _test_api_key(self, api_key: str) -> str | None:
-        session = async_get_clientsession(self.hass)
-        try:
-            async with session.get(
-                f"{MISTRAL_API_BASE}/models",
-                headers={"Authorization": f"Bearer {api_key}"},
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as resp:
-                if resp.status == 401:
-                    return "invalid_auth"
-                if resp.status != 200:
-                    return "cannot_connect"
-        except aiohttp.ClientConnectorError:
-            return "cannot_connect"
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception("Unexpected error testing API key")
-            return "unknown"
-        return None
-
     @staticmethod
     def async_get_options_flow(
         config_entry: config_entries.ConfigEntry,
     ) -> "MistralOptionsFlow":
         return MistralOptionsFlow()
 
+    @classmethod
+    @callback
+    def async_get_supported_subentry_types(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> dict[str, type[config_entries.ConfigSubentryFlow]]:
+        return {SUBENTRY_AGENT: MistralAgentSubentryFlow}
+
 
 class MistralOptionsFlow(config_entries.OptionsFlow):
     """Options flow — HA injects self.config_entry as a read-only property."""
@@ -107,10 +161,22 @@ class MistralOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            known = set(entry_api_keys(self.config_entry))
+            for api_key in user_input.get(CONF_EXTRA_API_KEYS) or []:
+                api_key = api_key.strip()
+                if not api_key or api_key in known:
+                    continue
+                if error := await _async_test_api_key(self.hass, api_key):
+                    errors[CONF_EXTRA_API_KEYS] = error
+                    break
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
-        opts = self.config_entry.options
+        opts = {**self.config_entry.options, **(user_input or {})}
+        catalog = await async_get_catalog(self.hass)
 
         return self.async_show_form(
             step_id="init",
@@ -122,7 +188,8 @@ class MistralOptionsFlow(config_entries.OptionsFlow):
                         default=opts.get(CONF_MODEL, DEFAULT_MODEL),
                     ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
-                            options=CHAT_MODELS,
+                            options=catalog.chat_models(),
+                            custom_value=True,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         )
                     ),
@@ -160,6 +227,45 @@ class MistralOptionsFlow(config_entries.OptionsFlow):
                         CONF_CONTROL_HA,
                         default=opts.get(CONF_CONTROL_HA, DEFAULT_CONTROL_HA),
                     ): selector.BooleanSelector(),
+                    # ── Entity state deltas ───────────────────────────────
+                    vol.Optional(
+                        CONF_CONTEXT_RESYNC_INTERVAL,
+                        default=opts.get(
+                            CONF_CONTEXT_RESYNC_INTERVAL, DEFAULT_CONTEXT_RESYNC_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=3600,
+                            step=30,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # ── Re-prompt on invalid action ───────────────────────
+                    vol.Optional(
+                        CONF_REPROMPT_INVALID_ACTION,
+                        default=opts.get(
+                            CONF_REPROMPT_INVALID_ACTION, DEFAULT_REPROMPT_INVALID_ACTION
+                        ),
+                    ): selector.BooleanSelector(),
+                    # ── Background service calls ──────────────────────────
+                    vol.Optional(
+                        CONF_BACKGROUND_DOMAINS,
+                        default=opts.get(
+                            CONF_BACKGROUND_DOMAINS, DEFAULT_BACKGROUND_DOMAINS
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=sorted(ALLOWED_SERVICES),
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_AUTO_BACKGROUND,
+                        default=opts.get(CONF_AUTO_BACKGROUND, DEFAULT_AUTO_BACKGROUND),
+                    ): selector.BooleanSelector(),
                     # ── Continue conversation (experimental) ──────────────
                     vol.Optional(
                         CONF_CONTINUE_CONVERSATION,
@@ -167,6 +273,32 @@ class MistralOptionsFlow(config_entries.OptionsFlow):
                             CONF_CONTINUE_CONVERSATION, DEFAULT_CONTINUE_CONVERSATION
                         ),
                     ): selector.BooleanSelector(),
+                    # ── Extra API keys (load-balanced pool) ───────────────
+                    vol.Optional(
+                        CONF_EXTRA_API_KEYS,
+                        default=opts.get(CONF_EXTRA_API_KEYS, []),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD,
+                            multiple=True,
+                        )
+                    ),
+                    # ── Local OpenAI-compatible server ────────────────────
+                    **_backend_fields(opts),
+                    vol.Optional(
+                        CONF_LOCAL_BASE_URL,
+                        description={"suggested_value": opts.get(CONF_LOCAL_BASE_URL)},
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_LOCAL_API_KEY,
+                        description={"suggested_value": opts.get(CONF_LOCAL_API_KEY)},
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD
+                        )
+                    ),
                     # ── STT language ──────────────────────────────────────
                     vol.Optional(
                         CONF_STT_LANGUAGE,
@@ -180,6 +312,92 @@ class MistralOptionsFlow(config_entries.OptionsFlow):
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         )
                     ),
+                    # ── Single-call voice mode ────────────────────────────
+                    vol.Optional(
+                        CONF_AUDIO_INTENT,
+                        default=opts.get(CONF_AUDIO_INTENT, DEFAULT_AUDIO_INTENT),
+                    ): selector.BooleanSelector(),
                 }
             ),
+            errors=errors,
+        )
+
+
+class MistralAgentSubentryFlow(config_entries.ConfigSubentryFlow):
+    """Add or edit an agent profile: an extra conversation agent of the entry.
+
+    Only the profile's own settings are stored; everything else is
+    inherited from the entry options.
+    """
+
+    async def async_step_user(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.SubentryFlowResult:
+        if user_input is not None:
+            title = user_input.pop(CONF_NAME)
+            return self.async_create_entry(title=title, data=user_input)
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=await self._async_schema(
+                {CONF_NAME: "", **self._get_entry().options}
+            ),
+        )
+
+    async def async_step_reconfigure(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.SubentryFlowResult:
+        subentry = self._get_reconfigure_subentry()
+        if user_input is not None:
+            title = user_input.pop(CONF_NAME)
+            return self.async_update_and_abort(
+                self._get_entry(), subentry, title=title, data=user_input
+            )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=await self._async_schema(
+                {CONF_NAME: subentry.title, **subentry.data}
+            ),
+        )
+
+    async def _async_schema(self, defaults: dict[str, Any]) -> vol.Schema:
+        catalog = await async_get_catalog(self.hass)
+        return vol.Schema(
+            {
+                vol.Required(CONF_NAME, default=defaults[CONF_NAME]): str,
+                vol.Optional(
+                    CONF_MODEL,
+                    default=defaults.get(CONF_MODEL, DEFAULT_MODEL),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=catalog.chat_models(),
+                        custom_value=True,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Optional(
+                    CONF_PROMPT,
+                    default=defaults.get(CONF_PROMPT, DEFAULT_PROMPT),
+                ): selector.TemplateSelector(),
+                vol.Optional(
+                    CONF_TEMPERATURE,
+                    default=defaults.get(CONF_TEMPERATURE, DEFAULT_TEMPERATURE),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0.0,
+                        max=1.0,
+                        step=0.05,
+                        mode=selector.NumberSelectorMode.SLIDER,
+                    )
+                ),
+                **_backend_fields(defaults),
+                # Empty = every entity exposed to Assist
+                vol.Optional(
+                    CONF_EXPOSED_ENTITIES,
+                    default=defaults.get(CONF_EXPOSED_ENTITIES, []),
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(multiple=True)
+                ),
+            }
         )
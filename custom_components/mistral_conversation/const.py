@@ -12,6 +12,20 @@ CONF_TEMPERATURE = "temperature"
 CONF_CONTROL_HA = "control_ha"
 CONF_CONTINUE_CONVERSATION = "continue_conversation"
 CONF_STT_LANGUAGE = "stt_language"
+CONF_REPROMPT_INVALID_ACTION = "reprompt_invalid_action"
+CONF_BACKGROUND_DOMAINS = "background_domains"
+CONF_AUTO_BACKGROUND = "auto_background"
+CONF_EXTRA_API_KEYS = "extra_api_keys"
+CONF_EXPOSED_ENTITIES = "exposed_entities"
+CONF_BACKEND = "backend"
+CONF_LOCAL_BASE_URL = "local_base_url"
+CONF_LOCAL_API_KEY = "local_api_key"
+CONF_LOCAL_MODEL = "local_model"
+CONF_CONTEXT_RESYNC_INTERVAL = "context_resync_interval"
+CONF_AUDIO_INTENT = "audio_intent"
+
+# Config subentry types
+SUBENTRY_AGENT = "agent"
 
 # ---------------------------------------------------------------------------
 # Defaults
@@ -22,6 +36,12 @@ DEFAULT_TEMPERATURE = 0.7          # Mistral range: 0.0–1.0
 DEFAULT_CONTROL_HA = True
 DEFAULT_CONTINUE_CONVERSATION = False
 DEFAULT_STT_LANGUAGE = ""          # empty = Voxtral auto-detect
+DEFAULT_REPROMPT_INVALID_ACTION = False
+DEFAULT_BACKGROUND_DOMAINS: list[str] = []
+DEFAULT_AUTO_BACKGROUND = False
+DEFAULT_BACKEND = "cloud"
+DEFAULT_CONTEXT_RESYNC_INTERVAL = 300  # seconds; 0 = full entity list every turn
+DEFAULT_AUDIO_INTENT = False
 
 DEFAULT_PROMPT = (
     "You are a helpful voice assistant for a smart home called {{ ha_name }}.\n"
@@ -32,7 +52,9 @@ DEFAULT_PROMPT = (
 
 # ---------------------------------------------------------------------------
 # Available chat models
-# Ordered by suitability for home automation (fast + instruction-following first)
+# Fallback until the /models catalog has been fetched, and the order in
+# which catalog models are offered. Ordered by suitability for home
+# automation (fast + instruction-following first)
 # ---------------------------------------------------------------------------
 CHAT_MODELS = [
     "ministral-8b-latest",    # Best for HA: fast, great instruction following, low cost
@@ -42,12 +64,49 @@ CHAT_MODELS = [
     "open-mistral-nemo",      # Open-source, compact
 ]
 
+# ---------------------------------------------------------------------------
+# Service execution
+# ---------------------------------------------------------------------------
+SERVICE_CALL_TIMEOUT = 30          # seconds, blocking and background calls
+SLOW_DOMAIN_THRESHOLD = 1.5        # seconds; average above this counts as slow
+SLOW_DOMAIN_MIN_SAMPLES = 3        # calls measured before a domain can be slow
+EVENT_SERVICE_CALL_FAILED = f"{DOMAIN}_service_call_failed"
+
+# ---------------------------------------------------------------------------
+# Entity context
+# ---------------------------------------------------------------------------
+DELTA_MAX_RATIO = 0.25             # resync once a delta exceeds this share of the full list
+
+# ---------------------------------------------------------------------------
+# Dispatcher signals (suffixed with the config entry ID)
+# ---------------------------------------------------------------------------
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated"
+SIGNAL_KEY_USAGE_UPDATED = f"{DOMAIN}_key_usage_updated"
+SIGNAL_CONTINUATION_UPDATED = f"{DOMAIN}_continuation_updated"
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+BACKEND_CLOUD = "cloud"            # Mistral API only
+BACKEND_LOCAL = "local"            # local server first, Mistral API as fallback
+LOCAL_TIMEOUT = 15                 # seconds before a local request fails over
+LOCAL_HEALTH_TIMEOUT = 3           # seconds for the /models health probe
+LOCAL_HEALTH_INTERVAL = 30         # seconds between health probes
+
 # ---------------------------------------------------------------------------
 # STT
 # ---------------------------------------------------------------------------
 STT_MODEL = "voxtral-mini-latest"
+CONTINUE_STT_WINDOW = 30           # seconds in which STT counts as the follow-up of a continued reply
+AUDIO_CHAT_MODEL = "voxtral-mini-latest"  # audio understanding in chat completions
+AUDIO_REPLY_TTL = 30               # seconds a single-call reply waits for its transcript
 
 # ---------------------------------------------------------------------------
 # API
 # ---------------------------------------------------------------------------
 MISTRAL_API_BASE = "https://api.mistral.ai/v1"
+CATALOG_TTL = 24 * 60 * 60         # seconds before /models is fetched again
+CATALOG_CHECK_INTERVAL = 60 * 60   # seconds between checks whether the TTL has passed
+KEY_COOLDOWN = 60                  # seconds a key rests after a 429 without Retry-After
+KEY_INVALID_COOLDOWN = 60 * 60     # seconds a rejected (401) key is skipped
+CHARS_PER_TOKEN = 4                # rough estimate for context-window budgeting
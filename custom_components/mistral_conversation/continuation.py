@@ -0,0 +1,82 @@
+"""Deciding when to keep listening, and how often that was wasted."""
+from __future__ import annotations
+
+import re
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import CONTINUE_STT_WINDOW, SIGNAL_CONTINUATION_UPDATED
+
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+# Quoted text is reported speech, not a question to the user. Single
+# quotes are left alone because they double as apostrophes.
+_QUOTED_RE = re.compile(r'"[^"]*"|“[^”]*”|„[^“”]*[“”]|«[^»]*»|「[^」]*」')
+# Closing brackets, markup and emoji that may follow the final punctuation
+_TRAILING_RE = re.compile(r"[\s)\]}*_~\u2600-\u27bf\ufe0f\U0001f000-\U0001faff]+$")
+
+_DEFAULT_QUESTION_MARKS = ("?", "？")
+# Languages that end questions with something other than "?"
+_QUESTION_MARKS: dict[str, tuple[str, ...]] = {
+    "ar": ("?", "؟"),
+    "fa": ("?", "؟"),
+    "ur": ("?", "؟"),
+    "el": ("?", ";", "\u037e"),  # Greek question mark
+    "hy": ("?", "՞"),
+}
+
+
+def reply_expects_answer(text: str, language: str) -> bool:
+    """Return True if the final sentence of a reply is a question.
+
+    Fallback for replies without an explicit `expects_reply` flag. URLs
+    and quoted text are ignored, so "?" in a link or a quotation does not
+    keep the microphone open.
+    """
+    text = _QUOTED_RE.sub("", _URL_RE.sub("", text))
+    text = _TRAILING_RE.sub("", text)
+    marks = _QUESTION_MARKS.get(
+        language.partition("-")[0].lower(), _DEFAULT_QUESTION_MARKS
+    )
+    return text.endswith(marks)
+
+
+class ContinuationStats:
+    """Counts continued conversations and the follow-ups that were silent.
+
+    After the agent keeps the microphone open, the next STT result of the
+    entry within CONTINUE_STT_WINDOW is the user's follow-up. If Voxtral
+    heard no speech in it, the extra listen cycle and upload were wasted.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self._signal = f"{SIGNAL_CONTINUATION_UPDATED}_{entry_id}"
+        self.continued = 0
+        self.silent = 0
+        self._pending_until = 0.0
+
+    @property
+    def awaiting_follow_up(self) -> bool:
+        """Return True while the next STT result answers a continued reply."""
+        return time.monotonic() <= self._pending_until
+
+    def record_continue(self) -> None:
+        """Note that a reply kept the microphone open."""
+        self.continued += 1
+        self._pending_until = time.monotonic() + CONTINUE_STT_WINDOW
+        async_dispatcher_send(self._hass, self._signal)
+
+    def record_stt_result(self, silent: bool) -> None:
+        """Count a silent transcript if it answered a continued conversation.
+
+        `silent` means the transcription finished without text; failed
+        requests end the wait without being counted.
+        """
+        if time.monotonic() > self._pending_until:
+            return
+        self._pending_until = 0.0
+        if silent:
+            self.silent += 1
+            async_dispatcher_send(self._hass, self._signal)
@@ -1,9 +1,8 @@
 """Conversation platform for Mistral AI."""
 from __future__ import annotations
 
-import json
 import logging
-import re
+import time
 from typing import Literal
 
 import aiohttp
@@ -14,62 +13,68 @@ from homeassistant.components.conversation import (
     ConversationResult,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, MATCH_ALL
-from homeassistant.core import HomeAssistant
+from homeassistant.const import MATCH_ALL
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError, TemplateError
-from homeassistant.helpers import intent, template
+from homeassistant.helpers import device_registry as dr, intent
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from . import MistralData
+from .action import (
+    ACTION_CALL_SERVICE,
+    ACTION_PROMPT,
+    AUDIO_RESPONSE_FORMAT,
+    RESPONSE_FORMAT,
+    action_entity_ids,
+    action_problem,
+    parse_action,
+    parse_transcript,
+)
+from .audio_intent import AudioReplyCache, audio_user_message
+from .backend import chat_content, chat_request
+from .catalog import ModelCatalog, async_get_catalog
+from .continuation import reply_expects_answer
 from .const import (
+    AUDIO_CHAT_MODEL,
+    BACKEND_LOCAL,
+    CHARS_PER_TOKEN,
+    CONF_AUTO_BACKGROUND,
+    CONF_BACKEND,
+    CONF_BACKGROUND_DOMAINS,
+    CONF_CONTEXT_RESYNC_INTERVAL,
     CONF_CONTINUE_CONVERSATION,
     CONF_CONTROL_HA,
+    CONF_EXPOSED_ENTITIES,
+    CONF_LOCAL_MODEL,
     CONF_MAX_TOKENS,
     CONF_MODEL,
     CONF_PROMPT,
+    CONF_REPROMPT_INVALID_ACTION,
     CONF_TEMPERATURE,
+    DEFAULT_AUTO_BACKGROUND,
+    DEFAULT_BACKEND,
+    DEFAULT_BACKGROUND_DOMAINS,
+    DEFAULT_CONTEXT_RESYNC_INTERVAL,
     DEFAULT_CONTINUE_CONVERSATION,
     DEFAULT_CONTROL_HA,
     DEFAULT_MAX_TOKENS,
     DEFAULT_MODEL,
     DEFAULT_PROMPT,
+    DEFAULT_REPROMPT_INVALID_ACTION,
     DEFAULT_TEMPERATURE,
     DOMAIN,
     MISTRAL_API_BASE,
+    SIGNAL_OPTIONS_UPDATED,
 )
+from .state_context import EntityContext, EntityContextTracker, with_context
 
 _LOGGER = logging.getLogger(__name__)
 
-# Regex to extract a JSON object from model output, even inside markdown fences
-_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```|(\{[^`]*?\})", re.DOTALL)
-
-# ---------------------------------------------------------------------------
-# Allowed HA service calls (safety allow-list)
-# ---------------------------------------------------------------------------
-_ALLOWED_SERVICES: dict[str, list[str]] = {
-    "homeassistant": ["turn_on", "turn_off", "toggle"],
-    "light":         ["turn_on", "turn_off", "toggle"],
-    "switch":        ["turn_on", "turn_off", "toggle"],
-    "cover":         ["open_cover", "close_cover", "stop_cover", "set_cover_position"],
-    "media_player":  [
-        "turn_on", "turn_off", "toggle",
-        "media_play", "media_pause", "media_stop",
-        "volume_up", "volume_down", "volume_set", "volume_mute",
-        "select_source", "select_sound_mode",
-        "media_next_track", "media_previous_track",
-    ],
-    "fan":           ["turn_on", "turn_off", "toggle", "set_percentage", "set_preset_mode"],
-    "climate":       ["turn_on", "turn_off", "set_temperature", "set_hvac_mode"],
-    "lock":          ["lock", "unlock"],
-    "alarm_control_panel": ["alarm_arm_away", "alarm_arm_home", "alarm_disarm"],
-    "scene":         ["turn_on"],
-    "script":        ["turn_on"],
-    "automation":    ["turn_on", "turn_off", "trigger"],
-    "input_boolean": ["turn_on", "turn_off", "toggle"],
-    "input_number":  ["set_value"],
-    "number":        ["set_value"],
-}
+# Cap on entity IDs listed in a corrective re-prompt
+_MAX_CORRECTION_ENTITIES = 50
 
 
 async def async_setup_entry(
@@ -77,61 +82,71 @@ async def async_setup_entry(
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the Mistral AI conversation entity."""
-    async_add_entities([MistralConversationEntity(hass, config_entry)])
+    """Set up the default agent and one agent per profile subentry."""
+    catalog = await async_get_catalog(hass)
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    agent = MistralConversationEntity(hass, config_entry, catalog, data)
+    data.prepare_audio = agent.async_prepare_audio_turn
+    async_add_entities([agent])
+    for subentry_id in data.agent_ids:
+        async_add_entities(
+            [MistralConversationEntity(hass, config_entry, catalog, data, subentry_id)],
+            config_subentry_id=subentry_id,
+        )
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _get_exposed_entities(hass: HomeAssistant) -> list:
-    """Return all entity states that are exposed to voice assistants."""
-    try:
-        from homeassistant.components.homeassistant.exposed_entities import (
-            async_should_expose,
-        )
-        from homeassistant.components import conversation as _conv
-
-        return [
-            s for s in hass.states.async_all()
-            if async_should_expose(hass, _conv.DOMAIN, s.entity_id)
-        ]
-    except Exception:  # pylint: disable=broad-except
-        return list(hass.states.async_all())
-
-
-def _build_entity_context(hass: HomeAssistant) -> str:
-    """Build a compact text list of exposed entities for the system prompt."""
-    states = _get_exposed_entities(hass)
-    if not states:
-        return ""
-    lines = ["Exposed smart home devices:"]
-    for s in states:
-        name = s.attributes.get("friendly_name", s.entity_id)
-        lines.append(f"  {s.entity_id} | {name} | state: {s.state}")
-    return "\n".join(lines)
-
-
-def _extract_json(text: str) -> dict | None:
-    """Extract the first JSON object from text, handling markdown fences."""
-    try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError:
-        pass
-    for match in _JSON_RE.finditer(text):
-        candidate = match.group(1) or match.group(2)
-        if candidate:
-            try:
-                return json.loads(candidate.strip())
-            except json.JSONDecodeError:
-                continue
-    return None
-
-
-def _reply_contains_question(text: str) -> bool:
-    """Return True if the reply ends with or contains a question."""
-    return "?" in text
+def _compose_prompt(
+    base_prompt: str, context: EntityContext | None, text: str
+) -> tuple[str, str]:
+    """Return the system prompt and user message for a turn.
+
+    The entity listing, or the changes since the previous turn, goes in
+    front of the user message. `with_context` puts it back in front of
+    that message on later turns, until the listing is sent again.
+    """
+    if context is None:
+        return base_prompt, text
+    if prefix := context.prefix:
+        text = f"{prefix}\n\n{text}"
+    return base_prompt + ACTION_PROMPT, text
+
+
+def _fit_history(
+    history: list[dict], fixed_chars: int, context_length: int | None, max_tokens: int
+) -> list[dict]:
+    """Drop the oldest turns until the request fits the model's context window."""
+    if not context_length:
+        return history
+    budget = (context_length - max_tokens) * CHARS_PER_TOKEN - fixed_chars
+    used = sum(len(m["content"]) for m in history)
+    start = 0
+    while used > budget and start < len(history):
+        # Drop a whole user/assistant turn at a time
+        used -= sum(len(m["content"]) for m in history[start : start + 2])
+        start += 2
+    return history[start:]
+
+
+def _correction_prompt(
+    problem: str, domain: str, exposed: dict[str, frozenset[str]]
+) -> str:
+    """Explain a rejected action to the model so it can correct itself."""
+    valid = sorted(exposed.get(domain, ()))[:_MAX_CORRECTION_ENTITIES]
+    if domain == "homeassistant":
+        hint = ""
+    elif valid:
+        hint = f" Exposed {domain} entities: {', '.join(valid)}."
+    else:
+        hint = f" There are no exposed {domain} entities."
+    return (
+        f"That action was rejected: {problem}.{hint} "
+        "Answer the previous request again with a valid action, "
+        "or reply that it cannot be done."
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -145,11 +160,74 @@ class MistralConversationEntity(ConversationEntity):
     _attr_name = None
     _attr_supported_features = ConversationEntityFeature.CONTROL
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        catalog: ModelCatalog,
+        data: MistralData,
+        subentry_id: str | None = None,
+    ) -> None:
         self.hass = hass
         self._entry = entry
-        self._attr_unique_id = f"{entry.entry_id}_conversation"
+        self._catalog = catalog
+        self._pool = data.pool
+        self._index = data.index
+        self._executor = data.executor
+        self._templates = data.templates
+        self._local = data.local
+        self._continuation = data.continuation
+        # None for the default agent, else the agent profile subentry
+        self._subentry_id = subentry_id
+        self._attr_unique_id = (
+            f"{subentry_id}_conversation" if subentry_id
+            else f"{entry.entry_id}_conversation"
+        )
         self._history: dict[str, list[dict]] = {}
+        self._context = EntityContextTracker()
+        self._audio_replies = AudioReplyCache()
+        # Options the device entry was built from
+        self._options = self._opts
+
+    @property
+    def _opts(self) -> dict:
+        """Entry options, overridden by the agent profile if there is one."""
+        if self._subentry_id is None:
+            return dict(self._entry.options)
+        return {
+            **self._entry.options,
+            **self._entry.subentries[self._subentry_id].data,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Pick up option changes without a reload."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_OPTIONS_UPDATED}_{self._entry.entry_id}",
+                self._async_options_updated,
+            )
+        )
+
+    @callback
+    def _async_options_updated(self) -> None:
+        """Apply new options in place, keeping history and shared caches.
+
+        The prompt template cache is keyed by the prompt text, so an edited
+        prompt is compiled on its next use without explicit invalidation.
+        """
+        new = self._opts
+        changed = {
+            key for key in new.keys() | self._options.keys()
+            if new.get(key) != self._options.get(key)
+        }
+        self._options = new
+        if CONF_MODEL in changed and self.device_entry is not None:
+            dr.async_get(self.hass).async_update_device(
+                self.device_entry.id, model=new.get(CONF_MODEL, DEFAULT_MODEL)
+            )
+        _LOGGER.debug("Applied changed options in place: %s", sorted(changed))
 
     @property
     def supported_languages(self) -> list[str] | Literal["*"]:
@@ -157,17 +235,29 @@ class MistralConversationEntity(ConversationEntity):
 
     @property
     def device_info(self) -> DeviceInfo:
-        """Separate device from STT entity."""
-        model = self._entry.options.get(CONF_MODEL, DEFAULT_MODEL)
+        """Separate device from STT entity, and one per agent profile."""
+        model = self._options.get(CONF_MODEL, DEFAULT_MODEL)
+        if self._subentry_id is None:
+            identifier = f"{self._entry.entry_id}_conversation"
+            name = "Mistral AI Conversation"
+        else:
+            identifier = f"{self._subentry_id}_conversation"
+            name = self._entry.subentries[self._subentry_id].title
         return DeviceInfo(
-            identifiers={(DOMAIN, f"{self._entry.entry_id}_conversation")},
-            name="Mistral AI Conversation",
+            identifiers={(DOMAIN, identifier)},
+            name=name,
             manufacturer="Mistral AI",
             model=model,
             entry_type=DeviceEntryType.SERVICE,
             configuration_url="https://console.mistral.ai",
         )
 
+    @property
+    def _exposed(self) -> dict[str, frozenset[str]]:
+        """Exposed entity IDs per domain that this agent may see and control."""
+        subset = frozenset(self._opts.get(CONF_EXPOSED_ENTITIES) or ())
+        return self._index.by_domain_for(subset)
+
     # ------------------------------------------------------------------
     # HA 2024.6+ API (preferred)
     # ------------------------------------------------------------------
@@ -188,8 +278,7 @@ class MistralConversationEntity(ConversationEntity):
     # Core processing
     # ------------------------------------------------------------------
     async def _process(self, user_input: ConversationInput) -> ConversationResult:
-        opts = self._entry.options
-        api_key = self._entry.data[CONF_API_KEY]
+        opts = self._opts
         control_ha = opts.get(CONF_CONTROL_HA, DEFAULT_CONTROL_HA)
         continue_conversation_enabled = opts.get(
             CONF_CONTINUE_CONVERSATION, DEFAULT_CONTINUE_CONVERSATION
@@ -197,73 +286,132 @@ class MistralConversationEntity(ConversationEntity):
         conv_id = user_input.conversation_id or self._new_id()
 
         # --- Build system prompt ------------------------------------------
-        raw_prompt = opts.get(CONF_PROMPT, DEFAULT_PROMPT)
-        try:
-            system_prompt = template.Template(raw_prompt, self.hass).async_render(
-                {"ha_name": self.hass.config.location_name},
-                parse_result=False,
-            )
-        except TemplateError as err:
-            _LOGGER.error("Error rendering prompt template: %s", err)
-            system_prompt = raw_prompt
+        system_prompt = self._render_prompt(opts)
 
+        # Full entity list on the first turn, then only what changed
+        context: EntityContext | None = None
         if control_ha:
-            ctx = _build_entity_context(self.hass)
-            if ctx:
-                system_prompt += f"\n\n{ctx}"
-            system_prompt += (
-                "\n\nWhen the user wants to control a device, respond with ONLY a raw JSON "
-                "object on one line — no extra text, no markdown fences:\n"
-                '{"action":"call_service","domain":"DOMAIN","service":"SERVICE","entity_id":"ENTITY_ID",'
-                '"service_data":{},"confirmation":"A short friendly confirmation in the user\'s language"}\n'
-                "Fill 'service_data' with any extra parameters needed (e.g. volume_level, temperature). "
-                "Leave it as {} if no extra parameters are needed. "
-                "Always write the 'confirmation' in the same language the user is speaking. "
-                "For information requests or general conversation, reply normally in plain text."
+            subset = frozenset(opts.get(CONF_EXPOSED_ENTITIES) or ())
+            states = self._index.async_states(subset)
+            resync_interval = float(
+                opts.get(CONF_CONTEXT_RESYNC_INTERVAL, DEFAULT_CONTEXT_RESYNC_INTERVAL)
             )
+            context = self._context.build(conv_id, states, resync_interval)
+
+        model = opts.get(CONF_MODEL, DEFAULT_MODEL)
+        max_tokens = int(opts.get(CONF_MAX_TOKENS, DEFAULT_MAX_TOKENS))
+        context_length = self._catalog.context_length(model)
 
         # --- Build message history ----------------------------------------
+        # Stored with the bare user text; the turns since the listing get
+        # their entity context back, older turns stay without
         history = self._history.get(conv_id, [])
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(history)
-        messages.append({"role": "user", "content": user_input.text})
+        if context is None:
+            self._context.discard(conv_id)
+            context_history = history
+        else:
+            context_history = with_context(history, context)
+        full_prompt, user_content = _compose_prompt(system_prompt, context, user_input.text)
+        context_history = _fit_history(
+            context_history, len(full_prompt) + len(user_content), context_length, max_tokens
+        )
+        if context is not None and len(context_history) // 2 < context.turns:
+            # The listing or a later delta was trimmed, so send the list again
+            context = self._context.build(conv_id, states, resync_interval, force=True)
+            full_prompt, user_content = _compose_prompt(
+                system_prompt, context, user_input.text
+            )
+            context_history = _fit_history(
+                history, len(full_prompt) + len(user_content), context_length, max_tokens
+            )
+        if context is not None and not context.full:
+            _LOGGER.debug(
+                "Entity context: ~%d tokens saved (~%d-token list, ~%d tokens of deltas)",
+                context.saved_chars // CHARS_PER_TOKEN,
+                context.full_chars // CHARS_PER_TOKEN,
+                context.delta_chars // CHARS_PER_TOKEN,
+            )
+        messages = [{"role": "system", "content": full_prompt}]
+        messages.extend(context_history)
+        messages.append({"role": "user", "content": user_content})
 
         # --- Call Mistral API ---------------------------------------------
-        model = opts.get(CONF_MODEL, DEFAULT_MODEL)
-        max_tokens = int(opts.get(CONF_MAX_TOKENS, DEFAULT_MAX_TOKENS))
         temperature = max(0.0, min(1.0, float(opts.get(CONF_TEMPERATURE, DEFAULT_TEMPERATURE))))
 
-        raw_reply = await self._post_chat(
-            api_key=api_key,
-            payload={
-                "model": model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-            },
-            conv_id=conv_id,
-            language=user_input.language,
-        )
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if control_ha:
+            # JSON mode: the reply is always a schema-conforming object
+            payload["response_format"] = RESPONSE_FORMAT
+
+        # A new conversation may already have been answered with the audio
+        raw_reply = None if history else self._audio_replies.pop(user_input.text)
+        if raw_reply is None:
+            raw_reply = await self._post_chat(
+                payload=payload,
+                conv_id=conv_id,
+                language=user_input.language,
+            )
 
         # _post_chat returns a ConversationResult directly on error
         if isinstance(raw_reply, ConversationResult):
             return raw_reply
 
+        # Parsed once; used for the re-prompt, the service call and continuing
+        action = parse_action(raw_reply) if control_ha else None
+
+        # --- Optionally let the model correct an invalid action ----------
+        if control_ha and opts.get(
+            CONF_REPROMPT_INVALID_ACTION, DEFAULT_REPROMPT_INVALID_ACTION
+        ):
+            problem = self._action_problem(action)
+            if problem:
+                _LOGGER.debug("Re-prompting after rejected action: %s", problem)
+                payload["messages"] = [
+                    *messages,
+                    {"role": "assistant", "content": raw_reply},
+                    {
+                        "role": "user",
+                        "content": _correction_prompt(
+                            problem, action["domain"], self._exposed
+                        ),
+                    },
+                ]
+                retry = await self._post_chat(
+                    payload=payload,
+                    conv_id=conv_id,
+                    language=user_input.language,
+                )
+                if not isinstance(retry, ConversationResult):
+                    raw_reply = retry
+                    action = parse_action(raw_reply)
+
         # --- Optionally execute a HA service call -------------------------
-        reply = await self._maybe_execute_service(raw_reply, user_input, control_ha)
+        reply = await self._maybe_execute_service(raw_reply, action, user_input)
 
         # --- Update rolling history (max 20 turns = 40 messages) ----------
         updated_history = list(history)
         updated_history.append({"role": "user", "content": user_input.text})
         updated_history.append({"role": "assistant", "content": raw_reply})
         self._history[conv_id] = updated_history[-40:]
+        if context is not None:
+            self._context.commit(conv_id, context)
 
         # --- Decide whether to keep the microphone open -------------------
-        # If enabled, any reply ending with a question keeps listening.
-        should_continue = (
-            continue_conversation_enabled
-            and _reply_contains_question(reply)
-        )
+        # The model's expects_reply flag decides; without one, a reply
+        # whose final sentence is a question keeps listening.
+        should_continue = False
+        if continue_conversation_enabled:
+            if action is not None and action["expects_reply"] is not None:
+                should_continue = action["expects_reply"]
+            else:
+                should_continue = reply_expects_answer(reply, user_input.language)
+            if should_continue:
+                self._continuation.record_continue()
 
         intent_response = intent.IntentResponse(language=user_input.language)
         intent_response.async_set_speech(reply)
@@ -273,28 +421,124 @@ class MistralConversationEntity(ConversationEntity):
             continue_conversation=should_continue,
         )
 
+    def _render_prompt(self, opts: dict) -> str:
+        """Render the system prompt template, falling back to the raw text."""
+        raw_prompt = opts.get(CONF_PROMPT, DEFAULT_PROMPT)
+        try:
+            return self._templates.get(raw_prompt).async_render(
+                {"ha_name": self.hass.config.location_name},
+                parse_result=False,
+            )
+        except TemplateError as err:
+            _LOGGER.error("Error rendering prompt template: %s", err)
+            return raw_prompt
+
+    # ------------------------------------------------------------------
+    # Single-call voice mode
+    # ------------------------------------------------------------------
+    async def async_prepare_audio_turn(
+        self, wav_bytes: bytes, language: str
+    ) -> str | None:
+        """Transcribe and answer a voice command in one Voxtral chat request.
+
+        Returns the transcript and keeps the reply until the pipeline passes
+        that transcript to this agent. Returns None if the STT entity should
+        fall back to plain transcription.
+        """
+        opts = self._opts
+        if not opts.get(CONF_CONTROL_HA, DEFAULT_CONTROL_HA):
+            return None
+        subset = frozenset(opts.get(CONF_EXPOSED_ENTITIES) or ())
+        context = self._context.build(
+            "", self._index.async_states(subset), 0, force=True
+        )
+        system_prompt = f"{self._render_prompt(opts)}\n\n{context.text}{ACTION_PROMPT}"
+        payload = {
+            "model": AUDIO_CHAT_MODEL,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                audio_user_message(wav_bytes, language),
+            ],
+            "max_tokens": int(opts.get(CONF_MAX_TOKENS, DEFAULT_MAX_TOKENS)),
+            "temperature": max(
+                0.0, min(1.0, float(opts.get(CONF_TEMPERATURE, DEFAULT_TEMPERATURE)))
+            ),
+            "response_format": AUDIO_RESPONSE_FORMAT,
+        }
+        start = time.monotonic()
+        try:
+            raw_reply = await self._post_chat_cloud(payload)
+        except (aiohttp.ClientError, TimeoutError, HomeAssistantError) as err:
+            _LOGGER.warning("Single-call voice request failed: %s", err)
+            return None
+        transcript = parse_transcript(raw_reply)
+        if not transcript or parse_action(raw_reply) is None:
+            _LOGGER.warning("Single-call voice reply is not usable: %s", raw_reply)
+            return None
+        self._audio_replies.put(transcript, raw_reply)
+        _LOGGER.debug(
+            "Single-call voice request took %.2f s: %s",
+            time.monotonic() - start,
+            transcript,
+        )
+        return transcript
+
     # ------------------------------------------------------------------
     # HTTP call
     # ------------------------------------------------------------------
     async def _post_chat(
         self,
-        api_key: str,
         payload: dict,
         conv_id: str,
         language: str,
     ) -> str | ConversationResult:
-        """POST to the Mistral chat completions endpoint."""
-        session = async_get_clientsession(self.hass)
+        """Send a chat completion to the configured backend.
+
+        With the local backend selected and healthy, the request goes to the
+        local server first and falls back to the Mistral API if it fails.
+        """
+        opts = self._opts
+        use_local = (
+            opts.get(CONF_BACKEND, DEFAULT_BACKEND) == BACKEND_LOCAL
+            and self._local.available
+        )
         try:
+            if use_local:
+                local_payload = {
+                    **payload,
+                    "model": opts.get(CONF_LOCAL_MODEL) or payload["model"],
+                }
+                try:
+                    return await self._local.async_chat(local_payload)
+                except (aiohttp.ClientError, TimeoutError, HomeAssistantError) as err:
+                    _LOGGER.warning("Local model request failed, using Mistral cloud: %s", err)
+            return await self._post_chat_cloud(payload)
+
+        except (aiohttp.ClientError, TimeoutError, HomeAssistantError) as err:
+            _LOGGER.error("Mistral AI request failed: %s", err)
+            intent_response = intent.IntentResponse(language=language)
+            intent_response.async_set_error(
+                intent.IntentResponseErrorCode.UNKNOWN,
+                f"Sorry, I could not reach Mistral AI: {err}",
+            )
+            return ConversationResult(response=intent_response, conversation_id=conv_id)
+
+    async def _post_chat_cloud(self, payload: dict) -> str:
+        """POST to the Mistral chat completions endpoint.
+
+        A rate-limited (429) or rejected (401) key is put on cooldown and
+        the request is retried once with each remaining key in the pool.
+        """
+        session = async_get_clientsession(self.hass)
+        pool = self._pool
+        for attempt in range(len(pool)):
+            key = pool.select()
             async with session.post(
-                f"{MISTRAL_API_BASE}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30),
+                **chat_request(MISTRAL_API_BASE, key.api_key, payload, timeout=30)
             ) as resp:
+                pool.record_response(key, resp.status, resp.headers)
+                if resp.status in (401, 429) and attempt + 1 < len(pool):
+                    continue
                 if resp.status == 401:
                     raise HomeAssistantError("Invalid Mistral AI API key")
                 if resp.status == 429:
@@ -308,18 +552,15 @@ class MistralConversationEntity(ConversationEntity):
                         body,
                     )
                     raise HomeAssistantError(f"Mistral API error {resp.status}: {body}")
-                data = await resp.json()
-
-        except (aiohttp.ClientError, HomeAssistantError) as err:
-            _LOGGER.error("Mistral AI request failed: %s", err)
-            intent_response = intent.IntentResponse(language=language)
-            intent_response.async_set_error(
-                intent.IntentResponseErrorCode.UNKNOWN,
-                f"Sorry, I could not reach Mistral AI: {err}",
-            )
-            return ConversationResult(response=intent_response, conversation_id=conv_id)
+                try:
+                    data = await resp.json()
+                except ValueError as err:
+                    raise HomeAssistantError(f"Mistral API returned invalid JSON: {err}") from err
+                break
 
-        return data["choices"][0]["message"]["content"].strip()
+        content = chat_content(data)
+        pool.record_tokens(key, (data.get("usage") or {}).get("total_tokens", 0))
+        return content
 
     # ------------------------------------------------------------------
     # HA service execution
@@ -327,50 +568,76 @@ class MistralConversationEntity(ConversationEntity):
     async def _maybe_execute_service(
         self,
         raw_reply: str,
+        action: dict | None,
         user_input: ConversationInput,
-        control_ha: bool,
     ) -> str:
-        """If raw_reply is a JSON service call, execute it and return the AI-generated confirmation."""
-        if not control_ha:
-            return raw_reply
+        """If the parsed reply is a service call, execute it and return the AI-generated confirmation.
 
-        action = _extract_json(raw_reply)
-        if not (action and action.get("action") == "call_service"):
+        `action` is None without Control HA or if raw_reply is not an action.
+        """
+        if action is None:
             return raw_reply
+        if action["action"] != ACTION_CALL_SERVICE:
+            return action["speech"] or raw_reply
 
-        domain      = action.get("domain", "")
-        service     = action.get("service", "")
-        entity_id   = action.get("entity_id", "")
-        service_data = action.get("service_data") or {}
+        domain      = action["domain"]
+        service     = action["service"]
+        service_data = action["service_data"]
         # Confirmation is generated by the AI in the user's language
-        confirmation = action.get("confirmation", "").strip()
+        confirmation = action["speech"]
 
-        if service not in _ALLOWED_SERVICES.get(domain, []) and domain != "homeassistant":
-            _LOGGER.warning("Blocked service call: %s.%s", domain, service)
-            # Return the confirmation if present (AI may have written a refusal),
-            # otherwise fall back to a neutral message.
-            return confirmation or f"({domain}.{service} is not permitted)"
+        # Rejected in O(1) before anything is sent to the service registry
+        problem = self._action_problem(action)
+        if problem:
+            _LOGGER.warning("Blocked service call %s.%s: %s", domain, service, problem)
+            return f"({problem})"
+        entity_ids = action_entity_ids(action)
 
         # Merge entity_id into service_data
-        call_data: dict = {"entity_id": entity_id, **service_data}
+        call_data: dict = {"entity_id": entity_ids, **service_data}
+
+        if self._run_in_background(domain):
+            # Answer now; the executor reports failures via event + notification
+            self._executor.async_call_background(
+                domain, service, call_data, user_input.context
+            )
+            return confirmation or ", ".join(entity_ids)
 
         try:
-            await self.hass.services.async_call(
-                domain,
-                service,
-                call_data,
-                blocking=True,
-                context=user_input.context,
+            await self._executor.async_call(
+                domain, service, call_data, user_input.context
+            )
+        # The model wrote the confirmation before the call ran, so it is
+        # only spoken when the call succeeded
+        except TimeoutError:
+            _LOGGER.warning("Service call %s.%s is taking long", domain, service)
+            return (
+                f"{domain}.{service} has not responded yet. "
+                "You will get a notification if it fails."
             )
         except HomeAssistantError as err:
             _LOGGER.error("Service call %s.%s failed: %s", domain, service, err)
-            return confirmation or str(err)
+            return f"Sorry, that did not work: {err}"
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception("Unexpected error executing service %s.%s", domain, service)
-            return confirmation or "Something went wrong while executing that action."
+            return "Something went wrong while executing that action."
 
         # Return the AI-generated confirmation (already in the user's language)
-        return confirmation or entity_id
+        return confirmation or ", ".join(entity_ids)
+
+    def _run_in_background(self, domain: str) -> bool:
+        """Return True if calls in this domain should not hold up the reply."""
+        opts = self._opts
+        if domain in opts.get(CONF_BACKGROUND_DOMAINS, DEFAULT_BACKGROUND_DOMAINS):
+            return True
+        auto = opts.get(CONF_AUTO_BACKGROUND, DEFAULT_AUTO_BACKGROUND)
+        return auto and self._executor.is_slow(domain)
+
+    def _action_problem(self, action: dict | None) -> str | None:
+        """Return why a parsed reply is not an executable action, if it is one."""
+        if action is None or action["action"] != ACTION_CALL_SERVICE:
+            return None
+        return action_problem(action, self._exposed)
 
     @staticmethod
     def _new_id() -> str:
@@ -0,0 +1,116 @@
+"""Index of entities exposed to the conversation agent."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.const import MATCH_ALL
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import (
+    async_track_state_added_domain,
+    async_track_state_removed_domain,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _get_exposed_entities(hass: HomeAssistant) -> list[State]:
+    """Return all entity states that are exposed to voice assistants."""
+    try:
+        from homeassistant.components.homeassistant.exposed_entities import (
+            async_should_expose,
+        )
+        from homeassistant.components import conversation as _conv
+
+        return [
+            s for s in hass.states.async_all()
+            if async_should_expose(hass, _conv.DOMAIN, s.entity_id)
+        ]
+    except Exception:  # pylint: disable=broad-except
+        return list(hass.states.async_all())
+
+
+class ExposedEntityIndex:
+    """Exposed entity IDs grouped per domain.
+
+    Building the index means asking HA about every state, so it is done
+    lazily and only again after the registry, the exposure settings or the
+    set of states has changed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._by_domain: dict[str, frozenset[str]] | None = None
+        # Per-agent views, keyed by the agent's entity subset
+        self._subsets: dict[frozenset[str], dict[str, frozenset[str]]] = {}
+
+    @callback
+    def async_invalidate(self, *_args) -> None:
+        """Drop the index; it is rebuilt on next access."""
+        self._by_domain = None
+        self._subsets.clear()
+
+    @callback
+    def async_listen(self) -> CALLBACK_TYPE:
+        """Invalidate on relevant changes; return a callback that stops listening."""
+        unsubs = [
+            self._hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self.async_invalidate
+            ),
+            async_track_state_added_domain(self._hass, MATCH_ALL, self.async_invalidate),
+            async_track_state_removed_domain(self._hass, MATCH_ALL, self.async_invalidate),
+        ]
+        try:
+            from homeassistant.components.homeassistant.exposed_entities import (
+                async_listen_entity_updates,
+            )
+            from homeassistant.components import conversation as _conv
+
+            unsubs.append(
+                async_listen_entity_updates(
+                    self._hass, _conv.DOMAIN, self.async_invalidate
+                )
+            )
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Exposed entity updates not available; relying on registry events")
+
+        @callback
+        def _unsub() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _unsub
+
+    @property
+    def by_domain(self) -> dict[str, frozenset[str]]:
+        """Return exposed entity IDs per domain."""
+        if self._by_domain is None:
+            grouped: dict[str, set[str]] = {}
+            for state in _get_exposed_entities(self._hass):
+                grouped.setdefault(state.domain, set()).add(state.entity_id)
+            self._by_domain = {
+                domain: frozenset(ids) for domain, ids in grouped.items()
+            }
+        return self._by_domain
+
+    def by_domain_for(self, subset: frozenset[str]) -> dict[str, frozenset[str]]:
+        """Return exposed entity IDs per domain, limited to subset if not empty."""
+        if not subset:
+            return self.by_domain
+        if (view := self._subsets.get(subset)) is None:
+            view = self._subsets[subset] = {
+                domain: ids & subset
+                for domain, ids in self.by_domain.items()
+                if ids & subset
+            }
+        return view
+
+    def async_states(self, subset: frozenset[str] = frozenset()) -> list[State]:
+        """Return the current states of the exposed entities (in subset)."""
+        states = self._hass.states
+        return [
+            state
+            for ids in self.by_domain_for(subset).values()
+            for entity_id in sorted(ids)
+            if (state := states.get(entity_id)) is not None
+        ]
@@ -0,0 +1,152 @@
+"""Pool of Mistral API keys with rate-limit aware selection."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    CONF_EXTRA_API_KEYS,
+    KEY_COOLDOWN,
+    KEY_INVALID_COOLDOWN,
+    SIGNAL_KEY_USAGE_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# (remaining, limit) header pairs Mistral sends; the scarcest one wins
+_RATE_LIMIT_HEADERS = (
+    ("x-ratelimit-remaining-req-minute", "x-ratelimit-limit-req-minute"),
+    ("x-ratelimit-remaining-tokens-minute", "x-ratelimit-limit-tokens-minute"),
+    ("x-ratelimit-remaining-tokens-month", "x-ratelimit-limit-tokens-month"),
+)
+
+
+def entry_api_keys(entry: ConfigEntry) -> list[str]:
+    """Return the primary API key followed by any extra keys of an entry."""
+    extra = entry.options.get(CONF_EXTRA_API_KEYS) or []
+    keys = [entry.data[CONF_API_KEY], *extra]
+    return list(dict.fromkeys(key.strip() for key in keys if key.strip()))
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Return a short, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+@dataclass
+class ApiKeyState:
+    """Usage and rate-limit state of one API key."""
+
+    api_key: str
+    fingerprint: str
+    name: str
+    headroom: float = 1.0
+    cooldown_until: float = 0.0
+    last_used: float = 0.0
+    requests: int = 0
+    tokens: int = 0
+    rate_limited: int = 0
+
+    @property
+    def available(self) -> bool:
+        """Return True if the key is not cooling down."""
+        return time.monotonic() >= self.cooldown_until
+
+
+class ApiKeyPool:
+    """Spread requests over API keys by remaining rate-limit headroom."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, api_keys: list[str]) -> None:
+        self._hass = hass
+        self._signal = f"{SIGNAL_KEY_USAGE_UPDATED}_{entry_id}"
+        self.keys = [
+            ApiKeyState(
+                api_key=key,
+                fingerprint=key_fingerprint(key),
+                name=f"…{key[-4:]}",
+            )
+            for key in api_keys
+        ]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def api_keys(self) -> list[str]:
+        """Return the raw keys in pool order."""
+        return [state.api_key for state in self.keys]
+
+    def select(self) -> ApiKeyState:
+        """Return the available key with the most headroom.
+
+        Ties go to the least recently used key. If every key is cooling
+        down, the one that becomes available first is returned. A key whose
+        cooldown has ended gets full headroom back until its next response
+        says otherwise; the 0 recorded for its 429 would never be updated
+        if the key were not picked again.
+        """
+        available = [state for state in self.keys if state.available]
+        if not available:
+            return min(self.keys, key=lambda state: state.cooldown_until)
+        if recovered := [state for state in available if state.cooldown_until]:
+            for state in recovered:
+                state.headroom = 1.0
+                state.cooldown_until = 0.0
+            async_dispatcher_send(self._hass, self._signal)
+        state = max(available, key=lambda state: (state.headroom, -state.last_used))
+        state.last_used = time.monotonic()
+        return state
+
+    def record_response(
+        self, state: ApiKeyState, status: int, headers: Mapping[str, str]
+    ) -> None:
+        """Update a key from the status and rate-limit headers of a response."""
+        state.requests += 1
+        headroom = _headroom(headers)
+        if headroom is not None:
+            state.headroom = headroom
+        if status == 429:
+            state.rate_limited += 1
+            state.headroom = 0.0
+            state.cooldown_until = time.monotonic() + _retry_after(headers)
+            _LOGGER.warning("Mistral API key %s rate limited, cooling down", state.name)
+        elif status == 401:
+            state.cooldown_until = time.monotonic() + KEY_INVALID_COOLDOWN
+            _LOGGER.error("Mistral API key %s was rejected", state.name)
+        async_dispatcher_send(self._hass, self._signal)
+
+    def record_tokens(self, state: ApiKeyState, tokens: int) -> None:
+        """Add the tokens billed for a successful request."""
+        if tokens:
+            state.tokens += tokens
+            async_dispatcher_send(self._hass, self._signal)
+
+
+def _headroom(headers: Mapping[str, str]) -> float | None:
+    """Return the smallest remaining/limit fraction in the headers."""
+    fractions = []
+    for remaining_header, limit_header in _RATE_LIMIT_HEADERS:
+        try:
+            remaining = float(headers[remaining_header])
+            limit = float(headers[limit_header])
+        except (KeyError, ValueError):
+            continue
+        if limit > 0:
+            fractions.append(max(0.0, min(1.0, remaining / limit)))
+    return min(fractions) if fractions else None
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    """Return the cooldown requested by the server, or the default."""
+    try:
+        return max(1.0, float(headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return KEY_COOLDOWN
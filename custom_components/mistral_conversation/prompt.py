@@ -0,0 +1,34 @@
+"""Prompt template cache shared by the agents of a config entry."""
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import template
+
+# Enough for every agent's prompt plus a few recently edited versions
+_MAX_TEMPLATES = 16
+
+
+class PromptTemplateCache:
+    """Compiled prompt templates keyed by their source text.
+
+    Jinja compiles a Template on first render and keeps the result on the
+    object, so agents that share a prompt — or render it every turn —
+    only pay for compilation once. Editing a prompt simply yields a new
+    key; the least recently used templates are evicted.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._templates: OrderedDict[str, template.Template] = OrderedDict()
+
+    def get(self, source: str) -> template.Template:
+        """Return the template for source, creating it if needed."""
+        if (tpl := self._templates.get(source)) is not None:
+            self._templates.move_to_end(source)
+            return tpl
+        tpl = self._templates[source] = template.Template(source, self._hass)
+        if len(self._templates) > _MAX_TEMPLATES:
+            self._templates.popitem(last=False)
+        return tpl
@@ -0,0 +1,193 @@
+"""Per-API-key usage and continue-conversation sensors for Mistral AI."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, SIGNAL_CONTINUATION_UPDATED, SIGNAL_KEY_USAGE_UPDATED
+from .continuation import ContinuationStats
+from .key_pool import ApiKeyState
+
+
+@dataclass(frozen=True, kw_only=True)
+class MistralKeySensorDescription(SensorEntityDescription):
+    """Describes a per-key usage sensor."""
+
+    value_fn: Callable[[ApiKeyState], float | int]
+
+
+@dataclass(frozen=True, kw_only=True)
+class MistralContinuationSensorDescription(SensorEntityDescription):
+    """Describes a continue-conversation counter."""
+
+    value_fn: Callable[[ContinuationStats], int]
+
+
+SENSORS: tuple[MistralKeySensorDescription, ...] = (
+    MistralKeySensorDescription(
+        key="requests",
+        name="requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda state: state.requests,
+    ),
+    MistralKeySensorDescription(
+        key="tokens",
+        name="tokens",
+        native_unit_of_measurement="tokens",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda state: state.tokens,
+    ),
+    MistralKeySensorDescription(
+        key="rate_limited",
+        name="rate limited",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda state: state.rate_limited,
+    ),
+    MistralKeySensorDescription(
+        key="headroom",
+        name="rate limit headroom",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state: round(state.headroom * 100),
+    ),
+)
+
+CONTINUATION_SENSORS: tuple[MistralContinuationSensorDescription, ...] = (
+    MistralContinuationSensorDescription(
+        key="continued",
+        name="Continued conversations",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.continued,
+    ),
+    MistralContinuationSensorDescription(
+        key="silent_follow_ups",
+        name="Silent follow-ups",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.silent,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up usage sensors for every key in the entry's pool."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        MistralKeyUsageSensor(config_entry, state, description)
+        for state in data.pool.keys
+        for description in SENSORS
+    )
+    async_add_entities(
+        MistralContinuationSensor(config_entry, data.continuation, description)
+        for description in CONTINUATION_SENSORS
+    )
+
+
+def _api_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Separate device for API usage."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{entry.entry_id}_api")},
+        name="Mistral AI API",
+        manufacturer="Mistral AI",
+        entry_type=DeviceEntryType.SERVICE,
+        configuration_url="https://console.mistral.ai/usage",
+    )
+
+
+class MistralKeyUsageSensor(SensorEntity):
+    """Usage of a single API key since Home Assistant started."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: MistralKeySensorDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        state: ApiKeyState,
+        description: MistralKeySensorDescription,
+    ) -> None:
+        self.entity_description = description
+        self._entry = entry
+        self._state = state
+        self._attr_name = f"API key {state.name} {description.name}"
+        self._attr_unique_id = (
+            f"{entry.entry_id}_{state.fingerprint}_{description.key}"
+        )
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Separate device for API usage."""
+        return _api_device_info(self._entry)
+
+    @property
+    def native_value(self) -> float | int:
+        return self.entity_description.value_fn(self._state)
+
+    async def async_added_to_hass(self) -> None:
+        """Update when the pool records a response."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_KEY_USAGE_UPDATED}_{self._entry.entry_id}",
+                self.async_write_ha_state,
+            )
+        )
+
+
+class MistralContinuationSensor(SensorEntity):
+    """How often continue-conversation kept listening, and for nothing."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: MistralContinuationSensorDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        stats: ContinuationStats,
+        description: MistralContinuationSensorDescription,
+    ) -> None:
+        self.entity_description = description
+        self._entry = entry
+        self._stats = stats
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Shown with the API usage sensors."""
+        return _api_device_info(self._entry)
+
+    @property
+    def native_value(self) -> int:
+        return self.entity_description.value_fn(self._stats)
+
+    async def async_added_to_hass(self) -> None:
+        """Update when a conversation continues or a follow-up is silent."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_CONTINUATION_UPDATED}_{self._entry.entry_id}",
+                self.async_write_ha_state,
+            )
+        )
@@ -0,0 +1,177 @@
+"""Service call execution with per-domain latency tracking."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Any
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import Context, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    EVENT_SERVICE_CALL_FAILED,
+    SERVICE_CALL_TIMEOUT,
+    SLOW_DOMAIN_MIN_SAMPLES,
+    SLOW_DOMAIN_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving latency average
+_EWMA_ALPHA = 0.3
+
+
+class ServiceExecutor:
+    """Run HA service calls, either blocking or as tracked background tasks."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._tasks: set[asyncio.Task] = set()
+        # domain -> (moving average in seconds, number of samples)
+        self._latency: dict[str, tuple[float, int]] = {}
+
+    def is_slow(self, domain: str) -> bool:
+        """Return True if calls in this domain are known to be slow."""
+        avg, samples = self._latency.get(domain, (0.0, 0))
+        return samples >= SLOW_DOMAIN_MIN_SAMPLES and avg >= SLOW_DOMAIN_THRESHOLD
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        context: Context | None,
+    ) -> None:
+        """Call a service and wait up to SERVICE_CALL_TIMEOUT for it.
+
+        The call runs in its own task, so a timeout does not cancel the
+        service handler halfway through: TimeoutError is raised, the call
+        is left to finish, and a later failure is reported like a
+        background failure.
+        """
+        task = self._hass.async_create_background_task(
+            self._async_timed_call(domain, service, data, context),
+            f"{DOMAIN} {domain}.{service}",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        try:
+            async with asyncio.timeout(SERVICE_CALL_TIMEOUT):
+                await asyncio.shield(task)
+        except TimeoutError:
+            task.add_done_callback(
+                partial(self._async_report_late, domain, service, data, context)
+            )
+            raise
+
+    @callback
+    def async_call_background(
+        self,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        context: Context | None,
+    ) -> None:
+        """Start a service call without waiting; failures are reported afterwards."""
+        task = self._hass.async_create_background_task(
+            self._async_run_background(domain, service, data, context),
+            f"{DOMAIN} {domain}.{service}",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @callback
+    def async_cancel_all(self) -> None:
+        """Cancel background calls that are still running."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    async def _async_timed_call(
+        self,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        context: Context | None,
+    ) -> None:
+        start = time.monotonic()
+        try:
+            await self._hass.services.async_call(
+                domain, service, data, blocking=True, context=context
+            )
+        finally:
+            # Failures count too: a device that only answers late is slow
+            self._record(domain, time.monotonic() - start)
+
+    @callback
+    def _async_report_late(
+        self,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        context: Context | None,
+        task: asyncio.Task,
+    ) -> None:
+        """Report a call that failed after its caller stopped waiting."""
+        if not task.cancelled() and (err := task.exception()) is not None:
+            self._report_failure(domain, service, data, context, str(err) or repr(err))
+
+    async def _async_run_background(
+        self,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        context: Context | None,
+    ) -> None:
+        try:
+            await self.async_call(domain, service, data, context)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            # Still running: only the outcome is reported, by _async_report_late
+            _LOGGER.debug(
+                "Service call %s.%s still running after %s s",
+                domain, service, SERVICE_CALL_TIMEOUT,
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            self._report_failure(domain, service, data, context, str(err) or repr(err))
+
+    def _record(self, domain: str, seconds: float) -> None:
+        avg, samples = self._latency.get(domain, (seconds, 0))
+        avg = seconds if not samples else avg + _EWMA_ALPHA * (seconds - avg)
+        self._latency[domain] = (avg, samples + 1)
+        _LOGGER.debug(
+            "Service latency %s: %.0f ms (average %.0f ms)",
+            domain, seconds * 1000, avg * 1000,
+        )
+
+    def _report_failure(
+        self,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        context: Context | None,
+        error: str,
+    ) -> None:
+        """Fire an event and raise a persistent notification for a failed call."""
+        _LOGGER.error("Service call %s.%s failed: %s", domain, service, error)
+        entity_id = data.get("entity_id")
+        self._hass.bus.async_fire(
+            EVENT_SERVICE_CALL_FAILED,
+            {
+                "domain": domain,
+                "service": service,
+                "entity_id": entity_id,
+                "error": error,
+            },
+            context=context,
+        )
+        persistent_notification.async_create(
+            self._hass,
+            f"`{domain}.{service}` for `{entity_id}` failed: {error}",
+            title="Mistral AI Conversation",
+            notification_id=f"{DOMAIN}_{domain}_{service}_failed",
+        )
@@ -0,0 +1,162 @@
+"""Entity state context, sent in full once and as deltas on follow-up turns."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from homeassistant.core import State
+
+from .const import DELTA_MAX_RATIO
+
+# Conversations whose snapshot is remembered per agent
+_MAX_CONVERSATIONS = 32
+
+
+@dataclass
+class EntityContext:
+    """Entity context for one request.
+
+    Exactly one of `text` (the full listing) and `delta` (what changed
+    since the previous turn) is set, apart from an unchanged follow-up
+    turn where both are empty. It is prepended to the user message. The
+    history itself keeps the bare user text; `sent` holds what was
+    prepended to each turn since the listing, so those turns can be sent
+    with it again and add up to the current states. Turns before the
+    listing go without, so a request never carries two listings.
+    """
+
+    text: str
+    delta: str
+    lines: dict[str, str]
+    synced: float
+    # Context of each turn since the listing, oldest (the listing) first
+    sent: tuple[str, ...] = ()
+    # Delta characters sent since the listing, including this turn
+    delta_chars: int = 0
+    # Size of the full listing for the current states
+    full_chars: int = 0
+
+    @property
+    def prefix(self) -> str:
+        """Return the text prepended to this turn's user message."""
+        return self.text or self.delta
+
+    @property
+    def turns(self) -> int:
+        """Turns since the listing; all must still be in the history."""
+        return len(self.sent)
+
+    @property
+    def full(self) -> bool:
+        """Return True if this turn sends the full listing."""
+        return not self.sent
+
+    @property
+    def saved_chars(self) -> int:
+        """Characters saved compared with sending the full listing again."""
+        return 0 if self.full else self.full_chars - self.delta_chars
+
+
+def entity_lines(states: list[State]) -> dict[str, str]:
+    """Return the context line of each state, keyed by entity ID."""
+    return {
+        s.entity_id: (
+            f"  {s.entity_id} | {s.attributes.get('friendly_name', s.entity_id)}"
+            f" | state: {s.state}"
+        )
+        for s in states
+    }
+
+
+def render_entity_context(lines: dict[str, str]) -> str:
+    """Return the full entity listing."""
+    if not lines:
+        return ""
+    return "\n".join(["Exposed smart home devices:", *lines.values()])
+
+
+def _render_delta(previous: dict[str, str], lines: dict[str, str]) -> str:
+    """Return the lines that changed, appeared or disappeared."""
+    changed = [line for entity_id, line in lines.items() if previous.get(entity_id) != line]
+    changed.extend(
+        f"  {entity_id} | removed" for entity_id in previous.keys() - lines.keys()
+    )
+    if not changed:
+        return ""
+    return "\n".join(["Device changes since the previous message:", *changed])
+
+
+class EntityContextTracker:
+    """Remembers the entity states last sent in each conversation.
+
+    A conversation starts with the full listing. Later turns only send what
+    changed since the previous turn, until the resync interval passes or
+    the deltas sent since the listing stop being small.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: OrderedDict[str, EntityContext] = OrderedDict()
+
+    def build(
+        self,
+        conv_id: str,
+        states: list[State],
+        resync_interval: float,
+        force: bool = False,
+    ) -> EntityContext:
+        """Return the context for the next turn of a conversation."""
+        lines = entity_lines(states)
+        now = time.monotonic()
+        snapshot = self._snapshots.get(conv_id)
+        if (
+            not force
+            and snapshot is not None
+            and now - snapshot.synced < resync_interval
+        ):
+            full_chars = len(render_entity_context(lines))
+            delta = _render_delta(snapshot.lines, lines)
+            delta_chars = snapshot.delta_chars + len(delta)
+            if delta_chars <= full_chars * DELTA_MAX_RATIO:
+                return EntityContext(
+                    text="",
+                    delta=delta,
+                    lines=lines,
+                    synced=snapshot.synced,
+                    sent=snapshot.sent,
+                    delta_chars=delta_chars,
+                    full_chars=full_chars,
+                )
+        text = render_entity_context(lines)
+        return EntityContext(
+            text=text, delta="", lines=lines, synced=now, full_chars=len(text)
+        )
+
+    def commit(self, conv_id: str, context: EntityContext) -> None:
+        """Remember the context once its turn has been added to the history."""
+        context.sent = (*context.sent, context.prefix)
+        self._snapshots[conv_id] = context
+        self._snapshots.move_to_end(conv_id)
+        if len(self._snapshots) > _MAX_CONVERSATIONS:
+            self._snapshots.popitem(last=False)
+
+    def discard(self, conv_id: str) -> None:
+        """Forget a conversation that had a turn without entity context."""
+        self._snapshots.pop(conv_id, None)
+
+
+def with_context(history: list[dict], context: EntityContext) -> list[dict]:
+    """Return the history with each turn since the listing carrying its context.
+
+    Returns the bare history if it no longer holds all of those turns;
+    the caller then resyncs.
+    """
+    start = len(history) - 2 * context.turns
+    if not context.sent or start < 0:
+        return history
+    history = list(history)
+    for turn, prefix in enumerate(context.sent):
+        if prefix:
+            pos = start + 2 * turn
+            history[pos] = {**history[pos], "content": f"{prefix}\n\n{history[pos]['content']}"}
+    return history
@@ -19,14 +19,16 @@ from homeassistant.components.stt import (
     SpeechToTextEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from . import MistralData
 from .const import (
+    CONF_AUDIO_INTENT,
     CONF_STT_LANGUAGE,
+    DEFAULT_AUDIO_INTENT,
     DEFAULT_STT_LANGUAGE,
     DOMAIN,
     MISTRAL_API_BASE,
@@ -106,7 +108,8 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Voxtral STT entity."""
-    async_add_entities([MistralSTTEntity(hass, config_entry)])
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities([MistralSTTEntity(hass, config_entry, data)])
 
 
 class MistralSTTEntity(SpeechToTextEntity):
@@ -115,9 +118,13 @@ class MistralSTTEntity(SpeechToTextEntity):
     _attr_has_entity_name = True
     _attr_name = "Mistral AI STT (Voxtral)"
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, data: MistralData
+    ) -> None:
         self.hass = hass
         self._entry = entry
+        self._data = data
+        self._pool = data.pool
         self._attr_unique_id = f"{entry.entry_id}_stt"
 
     @property
@@ -162,6 +169,21 @@ class MistralSTTEntity(SpeechToTextEntity):
         stream: AsyncIterable[bytes],
     ) -> SpeechResult:
         """Collect raw PCM from HA pipeline, wrap in WAV, transcribe via Voxtral."""
+        result = await self._async_transcribe(metadata, stream)
+        # Only a finished transcription without text is silence; request
+        # failures and empty streams are not
+        self._data.continuation.record_stt_result(silent=result is None)
+        return result or SpeechResult("", SpeechResultState.ERROR)
+
+    async def _async_transcribe(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+    ) -> SpeechResult | None:
+        """Transcribe, trying single-call mode first if it is enabled.
+
+        Returns None if Voxtral transcribed the audio but heard no speech.
+        """
         pcm_data = b""
         async for chunk in stream:
             pcm_data += chunk
@@ -186,44 +208,66 @@ class MistralSTTEntity(SpeechToTextEntity):
             sample_width=int(metadata.bit_rate) // 8,
         )
 
-        api_key = self._entry.data[CONF_API_KEY]
         lang_code = (
             self._entry.options.get(CONF_STT_LANGUAGE, DEFAULT_STT_LANGUAGE) or ""
         ).strip()
 
+        # Single-call mode: the default agent transcribes and answers at once.
+        # A follow-up in a continued conversation is answered with its
+        # history, so the agent would not use the combined reply.
+        prepare_audio = self._data.prepare_audio
+        if (
+            prepare_audio is not None
+            and self._entry.options.get(CONF_AUDIO_INTENT, DEFAULT_AUDIO_INTENT)
+            and not self._data.continuation.awaiting_follow_up
+        ):
+            if transcript := await prepare_audio(wav_bytes, lang_code):
+                return SpeechResult(transcript, SpeechResultState.SUCCESS)
+            _LOGGER.debug("Single-call voice request failed; transcribing instead")
+
         session = async_get_clientsession(self.hass)
+        pool = self._pool
         try:
-            form = aiohttp.FormData()
-            form.add_field(
-                "file",
-                wav_bytes,
-                filename="audio.wav",
-                content_type="application/octet-stream",
-            )
-            form.add_field("model", STT_MODEL)
-            if lang_code:
-                form.add_field("language", lang_code)
-
-            async with session.post(
-                f"{MISTRAL_API_BASE}/audio/transcriptions",
-                headers={"Authorization": f"Bearer {api_key}"},
-                data=form,
-                timeout=aiohttp.ClientTimeout(total=60),
-            ) as resp:
-                if resp.status != 200:
-                    body = await resp.text()
-                    _LOGGER.error("Mistral STT HTTP %s: %s", resp.status, body)
-                    return SpeechResult("", SpeechResultState.ERROR)
-                result = await resp.json()
+            for attempt in range(len(pool)):
+                key = pool.select()
+                # FormData can only be serialised once, so build it per attempt
+                form = aiohttp.FormData()
+                form.add_field(
+                    "file",
+                    wav_bytes,
+                    filename="audio.wav",
+                    content_type="application/octet-stream",
+                )
+                form.add_field("model", STT_MODEL)
+                if lang_code:
+                    form.add_field("language", lang_code)
+
+                async with session.post(
+                    f"{MISTRAL_API_BASE}/audio/transcriptions",
+                    headers={"Authorization": f"Bearer {key.api_key}"},
+                    data=form,
+                    timeout=aiohttp.ClientTimeout(total=60),
+                ) as resp:
+                    pool.record_response(key, resp.status, resp.headers)
+                    if resp.status in (401, 429) and attempt + 1 < len(pool):
+                        continue
+                    if resp.status != 200:
+                        body = await resp.text()
+                        _LOGGER.error("Mistral STT HTTP %s: %s", resp.status, body)
+                        return SpeechResult("", SpeechResultState.ERROR)
+                    result = await resp.json()
+                    break
 
         except aiohttp.ClientError as err:
             _LOGGER.error("Mistral STT request failed: %s", err)
             return SpeechResult("", SpeechResultState.ERROR)
 
+        pool.record_tokens(key, (result.get("usage") or {}).get("total_tokens", 0))
+
         text = result.get("text", "").strip()
         if not text:
             _LOGGER.warning("Voxtral returned empty transcription")
-            return SpeechResult("", SpeechResultState.ERROR)
+            return None
 
         _LOGGER.debug("Voxtral transcription: %s", text)
         return SpeechResult(text, SpeechResultState.SUCCESS)
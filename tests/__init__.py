@@ -0,0 +1 @@
+"""Tests for the Mistral AI Conversation integration."""
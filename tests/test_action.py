@@ -0,0 +1,84 @@
+"""Finding the action object in model replies."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.mistral_conversation.action import (
+    IncrementalJsonParser,
+    parse_action,
+)
+
+REPLY = {"action": "reply", "speech": "Done."}
+REPLY_JSON = json.dumps(REPLY)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        REPLY_JSON,
+        f"```json\n{REPLY_JSON}\n```",
+        f"Here you go: {REPLY_JSON} Anything else?",
+        f"Sure :-{{ {REPLY_JSON}",
+        "{ " * 4000 + REPLY_JSON,
+        "{x} " * 1200 + REPLY_JSON,
+        f"{{not json {REPLY_JSON}}}",
+    ],
+    ids=["plain", "fenced", "prose", "emoticon", "stray-braces", "invalid-groups", "wrapped"],
+)
+def test_parse_action_finds_object(text: str) -> None:
+    """The first valid object is found wherever it is in the reply."""
+    action = parse_action(text)
+    assert action is not None
+    assert action["speech"] == "Done."
+
+
+def test_parse_action_nested_and_escaped() -> None:
+    """Braces and escaped quotes inside strings do not end the object."""
+    speech = 'He said "}{" \\ twice'
+    action = parse_action(
+        "Result: "
+        + json.dumps(
+            {
+                "action": "call_service",
+                "domain": "light",
+                "service": "turn_on",
+                "entity_id": "light.kitchen",
+                "service_data": {"brightness": 128, "color": {"r": 255}},
+                "speech": speech,
+            }
+        )
+    )
+    assert action is not None
+    assert action["service_data"] == {"brightness": 128, "color": {"r": 255}}
+    assert action["speech"] == speech
+
+
+def test_parse_action_without_object() -> None:
+    """Plain text and deeply nested garbage are not actions."""
+    assert parse_action("The light is on.") is None
+    assert parse_action("{" * 3000 + "}" * 3000) is None
+    assert parse_action('{"action": ' + "[" * 100000) is None
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_parser_chunked(size: int) -> None:
+    """The object is returned as soon as the chunk that closes it arrives."""
+    text = 'Ok {"action": "reply", "speech": "a \\"}\\" b", "x": {}} trailing {'
+    parser = IncrementalJsonParser()
+    closing = text.index("} trailing") + 1
+    for pos in range(0, len(text), size):
+        result = parser.feed(text[pos : pos + size])
+        if result is not None:
+            assert pos + size >= closing
+            break
+    assert parser.finish() == {"action": "reply", "speech": 'a "}" b', "x": {}}
+
+
+def test_parser_chunked_after_stray_brace() -> None:
+    """An object after an unclosed brace is found once the text ends."""
+    parser = IncrementalJsonParser()
+    for char in "Hmm :-{ " + REPLY_JSON:
+        assert parser.feed(char) is None
+    assert parser.finish() == REPLY
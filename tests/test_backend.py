@@ -0,0 +1,149 @@
+"""Local backend failover and recovery against a mocked local server."""
+from __future__ import annotations
+
+import aiohttp
+import pytest
+from homeassistant.components import conversation
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.mistral_conversation.backend import (
+    LocalBackend,
+    LocalRequestRejected,
+)
+from custom_components.mistral_conversation.const import (
+    BACKEND_LOCAL,
+    CONF_BACKEND,
+    CONF_CONTROL_HA,
+    CONF_LOCAL_BASE_URL,
+    DOMAIN,
+    MISTRAL_API_BASE,
+)
+
+LOCAL_URL = "http://127.0.0.1:8000/v1"
+
+
+def _completion(text: str) -> dict:
+    return {
+        "choices": [{"message": {"role": "assistant", "content": text}}],
+        "usage": {"total_tokens": 10},
+    }
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant) -> MockConfigEntry:
+    """A config entry that prefers the local server."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_API_KEY: "test-key"},
+        options={
+            CONF_BACKEND: BACKEND_LOCAL,
+            CONF_LOCAL_BASE_URL: LOCAL_URL,
+            CONF_CONTROL_HA: False,
+        },
+        minor_version=2,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        {"json": {"error": "model not loaded"}},
+        {"json": {"choices": [{"message": {"content": None}}]}},
+        {"status": 500, "text": "boom"},
+        {"status": 429, "text": "busy"},
+        {"exc": aiohttp.ClientConnectionError()},
+        {"exc": TimeoutError()},
+    ],
+)
+async def test_local_failure_marks_unhealthy(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    response: dict,
+) -> None:
+    """Any failed local request raises a handled error and marks the server down."""
+    backend = LocalBackend(hass, entry)
+    aioclient_mock.post(f"{LOCAL_URL}/chat/completions", **response)
+
+    with pytest.raises((HomeAssistantError, aiohttp.ClientError, TimeoutError)):
+        await backend.async_chat({"model": "m", "messages": []})
+    assert not backend.available
+
+    aioclient_mock.get(f"{LOCAL_URL}/models", json={"data": []})
+    await backend.async_health_check()
+    assert backend.available
+
+
+@pytest.mark.parametrize("status", [400, 404, 422])
+async def test_local_rejection_keeps_healthy(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    status: int,
+) -> None:
+    """A request the server refuses fails over without taking the server down."""
+    backend = LocalBackend(hass, entry)
+    aioclient_mock.post(
+        f"{LOCAL_URL}/chat/completions", status=status, text="model not found"
+    )
+
+    with pytest.raises(LocalRequestRejected):
+        await backend.async_chat({"model": "missing", "messages": []})
+    assert backend.available
+
+
+async def test_conversation_fails_over_and_recovers(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """A broken local server falls back to the cloud until a probe succeeds."""
+    aioclient_mock.get(f"{MISTRAL_API_BASE}/models", json={"data": []})
+    aioclient_mock.post(
+        f"{LOCAL_URL}/chat/completions", json={"error": "model not loaded"}
+    )
+    aioclient_mock.post(
+        f"{MISTRAL_API_BASE}/chat/completions", json=_completion("cloud reply")
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    agent_id = er.async_get(hass).async_get_entity_id(
+        "conversation", DOMAIN, f"{entry.entry_id}_conversation"
+    )
+    local = hass.data[DOMAIN][entry.entry_id].local
+
+    result = await conversation.async_converse(
+        hass, "hello", None, Context(), agent_id=agent_id
+    )
+    assert result.response.speech["plain"]["speech"] == "cloud reply"
+    assert not local.available
+
+    # While unhealthy, requests go straight to the cloud
+    calls = aioclient_mock.call_count
+    result = await conversation.async_converse(
+        hass, "again", None, Context(), agent_id=agent_id
+    )
+    assert result.response.speech["plain"]["speech"] == "cloud reply"
+    assert aioclient_mock.call_count == calls + 1
+
+    # The server comes back: the health probe re-enables it
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(f"{LOCAL_URL}/models", json={"data": []})
+    aioclient_mock.post(f"{LOCAL_URL}/chat/completions", json=_completion("local reply"))
+    await local.async_health_check()
+    assert local.available
+
+    result = await conversation.async_converse(
+        hass, "hello", None, Context(), agent_id=agent_id
+    )
+    assert result.response.speech["plain"]["speech"] == "local reply"
@@ -0,0 +1,134 @@
+"""Entity context deltas and history trimming."""
+from __future__ import annotations
+
+from homeassistant.core import State
+
+from custom_components.mistral_conversation.conversation import _fit_history
+from custom_components.mistral_conversation.state_context import (
+    EntityContextTracker,
+    with_context,
+)
+
+
+def _states(**overrides: str) -> list[State]:
+    states = {f"light.room_{i}": "off" for i in range(20)}
+    states.update(overrides)
+    return [
+        State(entity_id, state, {"friendly_name": entity_id})
+        for entity_id, state in states.items()
+    ]
+
+
+def _turn(
+    tracker: EntityContextTracker,
+    history: list[dict],
+    text: str,
+    states: list[State],
+    resync_interval: float = 300,
+) -> list[dict]:
+    """Run one turn the way the agent does; return the messages sent."""
+    context = tracker.build("conv", states, resync_interval)
+    prefix = f"{context.prefix}\n\n" if context.prefix else ""
+    messages = [
+        *with_context(history, context),
+        {"role": "user", "content": f"{prefix}{text}"},
+    ]
+    history.extend(
+        [{"role": "user", "content": text}, {"role": "assistant", "content": "ok"}]
+    )
+    tracker.commit("conv", context)
+    return messages
+
+
+def _listings(messages: list[dict]) -> int:
+    return sum(m["content"].count("Exposed smart home devices:") for m in messages)
+
+
+def test_follow_up_sends_only_changes() -> None:
+    """The listing is sent once; later turns add what changed."""
+    tracker = EntityContextTracker()
+    history: list[dict] = []
+    _turn(tracker, history, "hi", _states())
+
+    context = tracker.build("conv", _states(**{"light.room_3": "on"}), 300)
+    assert not context.full
+    assert context.turns == 1
+    assert context.text == ""
+    assert context.delta.splitlines() == [
+        "Device changes since the previous message:",
+        "  light.room_3 | light.room_3 | state: on",
+    ]
+    assert 0 < context.saved_chars < context.full_chars
+
+    unchanged = tracker.build("conv", _states(), 300)
+    assert unchanged.prefix == ""
+
+
+def test_history_carries_one_listing() -> None:
+    """Each request holds the current listing and the changes since it."""
+    tracker = EntityContextTracker()
+    history: list[dict] = []
+    _turn(tracker, history, "one", _states())
+    _turn(tracker, history, "two", _states(**{"light.room_1": "on"}))
+    messages = _turn(tracker, history, "three", _states(**{"light.room_1": "on"}))
+
+    assert _listings(messages) == 1
+    assert messages[0]["content"].startswith("Exposed smart home devices:")
+    assert messages[2]["content"].startswith("Device changes since the previous message:")
+    assert messages[4]["content"] == "three"
+    # The stored history keeps the bare user text
+    assert [m["content"] for m in history[::2]] == ["one", "two", "three"]
+
+
+def test_resync_drops_the_old_listing() -> None:
+    """With an interval of 0, every request has exactly one listing."""
+    tracker = EntityContextTracker()
+    history: list[dict] = []
+    for turn in range(20):
+        messages = _turn(tracker, history, f"turn {turn}", _states(), resync_interval=0)
+        assert _listings(messages) == 1
+        assert messages[-1]["content"].startswith("Exposed smart home devices:")
+
+
+def test_large_delta_resyncs() -> None:
+    """Changes that add up to a large share of the list trigger a resync."""
+    tracker = EntityContextTracker()
+    _turn(tracker, [], "hi", _states())
+    changed = {f"light.room_{i}": "on" for i in range(20)}
+    assert tracker.build("conv", _states(**changed), 300).full
+
+
+def test_removed_entity_in_delta() -> None:
+    """An entity that is no longer exposed is reported as removed."""
+    tracker = EntityContextTracker()
+    _turn(tracker, [], "hi", _states())
+    context = tracker.build("conv", _states()[1:], 300)
+    assert context.delta.endswith("light.room_0 | removed")
+
+
+def test_with_context_after_history_cap() -> None:
+    """If the listing turn is no longer in the history, nothing is added."""
+    tracker = EntityContextTracker()
+    history: list[dict] = []
+    for turn in range(3):
+        _turn(tracker, history, f"turn {turn}", _states())
+    context = tracker.build("conv", _states(), 300)
+    assert with_context(history[-2:], context) == history[-2:]
+
+    tracker.discard("conv")
+    assert tracker.build("conv", _states(), 300).full
+
+
+def test_fit_history() -> None:
+    """Whole turns are dropped, oldest first, until the request fits."""
+    history = []
+    for turn in range(5):
+        history.append({"role": "user", "content": "u" * 100})
+        history.append({"role": "assistant", "content": f"a{turn}" + "a" * 98})
+
+    assert _fit_history(history, 0, None, 100) == history
+    # (1000 - 100) tokens * 4 chars - 3000 fixed = 600 chars: three turns
+    fitted = _fit_history(history, 3000, 1000, 100)
+    assert len(fitted) == 6
+    assert fitted[1]["content"].startswith("a2")
+    assert _fit_history(history, 10_000, 1000, 100) == []